@@ -27,6 +27,10 @@ class Settings(BaseSettings):
     cors_allow_credentials: bool = True
     cors_allowed_headers: str = "Content-Type,Authorization,X-Request-ID"
     
+    # Seconds identical /memory/read merges are reused for; 0 (the default)
+    # disables. The cache is per-process, so only enable it with one worker.
+    read_cache_ttl_seconds: float = 0.0
+    
     # Monitoring (optional)
     sentry_dsn: Optional[str] = None
     environment: str = "development"
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.orm import Session
@@ -13,11 +13,21 @@ from app.models import App, Memory, ReadGrant, AuditEvent
 from app.schemas import (
     MemoryCreateRequest,
     MemoryCreateResponse,
+    MemoryBulkCreateRequest,
+    MemoryBulkCreateResponse,
     MemoryReadRequest,
     MemoryReadResponse,
+    MemoryReadBatchItem,
+    MemoryReadBatchRequest,
+    MemoryReadBatchResult,
+    MemoryReadBatchResponse,
+    MemoryReadMergedRequest,
+    MemoryReadMergedScope,
+    MemoryReadMergedResponse,
     MemoryReadContinueRequest,
     MemoryRevokeRequest,
     MemoryRevokeResponse,
+    detect_value_shape,
 )
 from app.utils import (
     hash_revocation_token,
@@ -25,6 +35,7 @@ from app.utils import (
     check_policy,
     normalize_value_json,
     merge_memories_deterministic,
+    merge_summary_structs,
 )
 from app.sanitization import (
     sanitize_user_id,
@@ -34,6 +45,7 @@ from app.sanitization import (
     sanitize_source,
     sanitize_json_value,
 )
+from app import read_cache
 from app.memoryscope.v2_api import router as v2_router
 from app.config import settings
 from app.logging_config import setup_logging, get_logger
@@ -205,8 +217,9 @@ def create_audit_event(
     revocation_grant_id: uuid.UUID = None,
     reason_code: str = None,
     meta: dict = None,
+    commit: bool = True,
 ):
-    """Create an audit event."""
+    """Create an audit event. Pass commit=False to leave it in the caller's transaction."""
     event = AuditEvent(
         event_type=event_type,
         app_id=app_id,
@@ -221,36 +234,23 @@ def create_audit_event(
         meta=meta,
     )
     db.add(event)
-    db.commit()
+    if commit:
+        db.commit()
 
 
-@app.post(
-    "/memory",
-    response_model=MemoryCreateResponse,
-    status_code=status.HTTP_201_CREATED,
-    responses={
-        201: {"description": "Memory created successfully"},
-        400: {"description": "Validation error"},
-    400: {"description": "Validation error"},
-    },
-    summary="Create a new memory",
-    description="Create a new memory. value_json must match an allowed shape for the scope.",
-    tags=["memories"],
-)
-def create_memory(
-    memory_request: MemoryCreateRequest,
-    app: App = Depends(_get_app),
-    db: Session = Depends(get_db),
-):
+def _build_memory(
+    memory_request,
+    user_id: str,
+    app: App,
+    created_at: datetime,
+) -> Memory:
     """
-    Create a new memory.
+    Sanitize, shape-check and normalize one create request into a Memory row.
     
-    Stores user memory data with automatic expiration based on TTL.
-    The value_json is validated against allowed shapes for the given scope.
+    memory_request is a MemoryCreateRequest or MemoryBulkCreateItem; user_id
+    must already be sanitized. Raises HTTPException(400) on invalid input.
     """
-    # Sanitize input
     try:
-        user_id = sanitize_user_id(memory_request.user_id)
         scope = sanitize_scope(memory_request.scope)
         domain = sanitize_domain(memory_request.domain) if memory_request.domain else None
         source = sanitize_source(memory_request.source)
@@ -263,7 +263,7 @@ def create_memory(
         )
     
     # Detect value shape
-    shape = MemoryCreateRequest._detect_shape(value_json)
+    shape = detect_value_shape(value_json)
     if shape is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -273,12 +273,7 @@ def create_memory(
     # Normalize value_json
     normalized_value = normalize_value_json(value_json, shape)
 
-    # Calculate expires_at
-    created_at = datetime.utcnow()
-    expires_at = created_at + timedelta(days=memory_request.ttl_days)
-
-    # Create memory
-    memory = Memory(
+    return Memory(
         user_id=user_id,
         scope=scope,
         domain=domain,
@@ -287,12 +282,49 @@ def create_memory(
         source=memory_request.source,
         ttl_days=memory_request.ttl_days,
         created_at=created_at,
-        expires_at=expires_at,
+        expires_at=created_at + timedelta(days=memory_request.ttl_days),
         app_id=app.id,
     )
+
+
+@app.post(
+    "/memory",
+    response_model=MemoryCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: {"description": "Memory created successfully"},
+        400: {"description": "Validation error"},
+    400: {"description": "Validation error"},
+    },
+    summary="Create a new memory",
+    description="Create a new memory. value_json must match an allowed shape for the scope.",
+    tags=["memories"],
+)
+def create_memory(
+    memory_request: MemoryCreateRequest,
+    app: App = Depends(_get_app),
+    db: Session = Depends(get_db),
+):
+    """
+    Create a new memory.
+    
+    Stores user memory data with automatic expiration based on TTL.
+    The value_json is validated against allowed shapes for the given scope.
+    """
+    # Sanitize input
+    try:
+        user_id = sanitize_user_id(memory_request.user_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    memory = _build_memory(memory_request, user_id, app, datetime.utcnow())
     db.add(memory)
     db.commit()
     db.refresh(memory)
+    read_cache.invalidate_user(app.id, user_id)
 
     # Audit
     create_audit_event(
@@ -300,8 +332,8 @@ def create_memory(
         event_type="MEMORY_WRITE",
         app_id=app.id,
         user_id=user_id,
-        scope=scope,
-        domain=domain,
+        scope=memory.scope,
+        domain=memory.domain,
         memory_ids=[memory.id],
     )
 
@@ -315,6 +347,76 @@ def create_memory(
     )
 
 
+@app.post(
+    "/memory/bulk",
+    response_model=MemoryBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: {"description": "Memories created successfully"},
+        400: {"description": "Validation error"},
+    },
+    summary="Create several memories for one user",
+    description="Create up to 1000 memories for a user in one request. All memories are validated first; if any is invalid, none are created.",
+    tags=["memories"],
+)
+def create_memories_bulk(
+    bulk_request: MemoryBulkCreateRequest,
+    app: App = Depends(_get_app),
+    db: Session = Depends(get_db),
+):
+    """
+    Create several memories in one request.
+    
+    Each memory goes through the same sanitization, shape detection and
+    normalization as POST /memory. Rows and their MEMORY_WRITE audit events
+    are inserted in one batched flush and committed together.
+    """
+    try:
+        user_id = sanitize_user_id(bulk_request.user_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    created_at = datetime.utcnow()
+    memories = [_build_memory(item, user_id, app, created_at) for item in bulk_request.memories]
+    db.add_all(memories)
+    # One batched INSERT; also assigns the ids the audit events reference
+    db.flush()
+    
+    # Audit: one MEMORY_WRITE per memory, as for single creates
+    for memory in memories:
+        create_audit_event(
+            db=db,
+            event_type="MEMORY_WRITE",
+            app_id=app.id,
+            user_id=user_id,
+            scope=memory.scope,
+            domain=memory.domain,
+            memory_ids=[memory.id],
+            commit=False,
+        )
+    
+    # Build the response before commit expires the rows, to avoid a reload per memory
+    response = MemoryBulkCreateResponse(
+        memories=[
+            MemoryCreateResponse(
+                id=memory.id,
+                user_id=memory.user_id,
+                scope=memory.scope,
+                domain=memory.domain,
+                created_at=memory.created_at,
+                expires_at=memory.expires_at,
+            )
+            for memory in memories
+        ]
+    )
+    db.commit()
+    read_cache.invalidate_user(app.id, user_id)
+    return response
+
+
 def _query_and_merge_memories(
     db: Session,
     app: App,
@@ -380,12 +482,17 @@ def read_memory(
     read_request: MemoryReadRequest,
     app: App = Depends(_get_app),
     db: Session = Depends(get_db),
+    x_bypass_cache: Optional[str] = Header(None),
 ):
     """
     Read memories with policy enforcement.
     
     Merges all active memories for the user/scope/domain and returns a summary.
     The purpose is validated against the policy matrix.
+    
+    When settings.read_cache_ttl_seconds is set, identical reads within it
+    reuse the merge (see app.read_cache); send X-Bypass-Cache: 1 to force a
+    fresh one.
     """
     # Sanitize input
     try:
@@ -421,14 +528,22 @@ def read_memory(
         )
 
     # Query and merge memories
-    merged, memory_ids = _query_and_merge_memories(
-        db=db,
-        app=app,
-        user_id=user_id,
-        scope=scope,
-        domain=domain,
-        max_age_days=read_request.max_age_days,
-    )
+    def merge():
+        return _query_and_merge_memories(
+            db=db,
+            app=app,
+            user_id=user_id,
+            scope=scope,
+            domain=domain,
+            max_age_days=read_request.max_age_days,
+        )
+
+    if (x_bypass_cache or "").lower() in ("1", "true"):
+        merged, memory_ids = merge()
+    else:
+        merged, memory_ids = read_cache.cached_merge(
+            app.id, user_id, scope, domain, read_request.max_age_days, merge
+        )
 
     # Create read_grant
     revocation_token = str(uuid.uuid4())
@@ -475,6 +590,211 @@ def read_memory(
     )
 
 
+@app.post(
+    "/memory/read/batch",
+    response_model=MemoryReadBatchResponse,
+    responses={
+        200: {"description": "Reads performed; denied reads carry an error"},
+        400: {"description": "Validation error"},
+    },
+    summary="Perform several reads for one user",
+    description="Run up to 100 reads for a user in one request. Each read is policy-checked and gets its own revocation_token, as for POST /memory/read; a denied read returns an error in its slot instead of failing the batch.",
+    tags=["memories"],
+)
+def read_memory_batch(
+    batch_request: MemoryReadBatchRequest,
+    app: App = Depends(_get_app),
+    db: Session = Depends(get_db),
+    x_bypass_cache: Optional[str] = Header(None),
+):
+    """
+    Perform several reads in one request.
+    
+    Each query goes through the same sanitization, policy check and merge as
+    POST /memory/read. Read grants and MEMORY_READ audit events for the whole
+    batch are flushed and committed together.
+    """
+    return MemoryReadBatchResponse(
+        results=_read_batch(batch_request, app, db, (x_bypass_cache or "").lower() in ("1", "true"))
+    )
+
+
+def _read_batch(
+    batch_request: MemoryReadBatchRequest,
+    app: App,
+    db: Session,
+    bypass_cache: bool,
+) -> list[MemoryReadBatchResult]:
+    """Perform the reads of a batch request; one result per query, in order."""
+    try:
+        user_id = sanitize_user_id(batch_request.user_id)
+        queries = [
+            (
+                sanitize_scope(query.scope),
+                sanitize_domain(query.domain) if query.domain else None,
+                sanitize_purpose(query.purpose),
+                query,
+            )
+            for query in batch_request.queries
+        ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    created_at = datetime.utcnow()
+    expires_at = created_at + timedelta(hours=24)
+    results = []
+    # (read_grant, audit kwargs) for reads that were allowed
+    granted = []
+    
+    for scope, domain, purpose, query in queries:
+        purpose_class = normalize_purpose(purpose)
+        audit = dict(
+            user_id=user_id,
+            scope=scope,
+            domain=domain,
+            purpose=purpose,
+            purpose_class=purpose_class,
+        )
+        
+        # Check policy (fail closed)
+        if not check_policy(scope, purpose_class):
+            create_audit_event(
+                db=db,
+                event_type="MEMORY_READ",
+                app_id=app.id,
+                reason_code="POLICY_DENIED",
+                commit=False,
+                **audit,
+            )
+            results.append(MemoryReadBatchResult(
+                error=f"Purpose class '{purpose_class}' not allowed for scope '{scope}'",
+            ))
+            continue
+        
+        def merge(scope=scope, domain=domain, max_age_days=query.max_age_days):
+            return _query_and_merge_memories(
+                db=db,
+                app=app,
+                user_id=user_id,
+                scope=scope,
+                domain=domain,
+                max_age_days=max_age_days,
+            )
+        
+        if bypass_cache:
+            merged, memory_ids = merge()
+        else:
+            merged, memory_ids = read_cache.cached_merge(
+                app.id, user_id, scope, domain, query.max_age_days, merge
+            )
+        
+        revocation_token = str(uuid.uuid4())
+        read_grant = ReadGrant(
+            revocation_token_hash=hash_revocation_token(revocation_token),
+            user_id=batch_request.user_id,
+            app_id=app.id,
+            scope=query.scope,
+            domain=query.domain,
+            purpose=query.purpose,
+            purpose_class=purpose_class,
+            max_age_days=query.max_age_days,
+            created_at=created_at,
+            expires_at=expires_at,
+        )
+        db.add(read_grant)
+        audit["memory_ids"] = memory_ids if memory_ids else None
+        granted.append((read_grant, audit))
+        results.append(MemoryReadBatchResult(
+            read=MemoryReadResponse(
+                summary_text=merged["summary_text"],
+                summary_struct=merged["summary_struct"],
+                confidence=merged["confidence"],
+                revocation_token=revocation_token,
+                expires_at=expires_at,
+            ),
+        ))
+    
+    # One batched INSERT for the grants; also assigns the ids the audit events reference
+    db.flush()
+    for read_grant, audit in granted:
+        create_audit_event(
+            db=db,
+            event_type="MEMORY_READ",
+            app_id=app.id,
+            revocation_grant_id=read_grant.id,
+            commit=False,
+            **audit,
+        )
+    db.commit()
+    
+    return results
+
+
+@app.post(
+    "/memory/read/merged",
+    response_model=MemoryReadMergedResponse,
+    responses={
+        200: {"description": "Reads performed and merged per scope; denied scopes are listed"},
+        400: {"description": "Validation error"},
+    },
+    summary="Read several scopes and domains, merged per scope",
+    description="Read every scope unfiltered and within each domain, for one purpose, and return one merged summary per scope. Every underlying read is policy-checked, granted and audited as for POST /memory/read.",
+    tags=["memories"],
+)
+def read_memory_merged(
+    merged_request: MemoryReadMergedRequest,
+    app: App = Depends(_get_app),
+    db: Session = Depends(get_db),
+    x_bypass_cache: Optional[str] = Header(None),
+):
+    """
+    Read scopes across domains and merge each scope's summaries.
+    
+    Runs the scope x (unfiltered + domains) reads as one batch (see
+    POST /memory/read/batch), then combines each scope's non-empty
+    summary_structs with merge_summary_structs, unfiltered read first.
+    Policy depends only on scope and purpose, so a scope is either read
+    in full or listed under denied.
+    """
+    queries = [
+        MemoryReadBatchItem(
+            scope=scope,
+            domain=domain,
+            purpose=merged_request.purpose,
+            max_age_days=merged_request.max_age_days,
+        )
+        for scope in merged_request.scopes
+        for domain in (None, *merged_request.domains)
+    ]
+    results = _read_batch(
+        MemoryReadBatchRequest(user_id=merged_request.user_id, queries=queries),
+        app,
+        db,
+        (x_bypass_cache or "").lower() in ("1", "true"),
+    )
+    
+    reads: Dict[str, list[MemoryReadResponse]] = {}
+    denied: Dict[str, str] = {}
+    for query, result in zip(queries, results):
+        if result.read is None:
+            denied[query.scope] = result.error
+        else:
+            reads.setdefault(query.scope, []).append(result.read)
+    
+    scopes = {}
+    for scope, scope_reads in reads.items():
+        found = [read for read in scope_reads if read.summary_struct]
+        scopes[scope] = MemoryReadMergedScope(
+            summary_struct=merge_summary_structs([read.summary_struct for read in found]),
+            confidence=max((read.confidence for read in found), default=0.0),
+            revocation_tokens=[read.revocation_token for read in scope_reads],
+        )
+    return MemoryReadMergedResponse(scopes=scopes, denied=denied)
+
+
 @app.post(
     "/memory/read/continue",
     response_model=MemoryReadResponse,
@@ -0,0 +1,81 @@
+"""
+Short-lived cache of merged read results.
+
+Identical reads arriving close together (e.g. determinism checks that read
+the same user/scope several times in a row) reuse the merge instead of
+re-querying and re-merging. Only the merge is cached: every read still runs
+its policy check and gets its own read grant, revocation token and audit
+event. Entries live for settings.read_cache_ttl_seconds and a user's
+entries are dropped whenever a memory is written for them.
+
+The cache and its invalidation are local to one process: a write handled by
+another worker or instance doesn't drop this process's entries, so there a
+read can lag a write by up to the TTL. It is therefore off by default
+(read_cache_ttl_seconds = 0) and only meant to be enabled for single-worker
+setups such as the test harness. Sharing it across workers would need a
+per-user write version stored in the database and checked on every read.
+"""
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.config import settings
+
+MergeResult = Tuple[Dict[str, Any], List[uuid.UUID]]
+
+_lock = threading.Lock()
+_entries: Dict[Hashable, Tuple[float, MergeResult]] = {}
+# Bumped on every write for a user; a merge computed across a write isn't stored
+_write_counts: Dict[Tuple[uuid.UUID, str], int] = {}
+
+
+def _is_fresh(expires_at: float) -> bool:
+    return time.monotonic() < expires_at
+
+
+def cached_merge(
+    app_id: uuid.UUID,
+    user_id: str,
+    scope: str,
+    domain: Optional[str],
+    max_age_days: Optional[int],
+    compute: Callable[[], MergeResult],
+) -> MergeResult:
+    """Return the cached merge for these read parameters, or compute and cache it."""
+    ttl = settings.read_cache_ttl_seconds
+    if ttl <= 0:
+        return compute()
+
+    key = (app_id, user_id, scope, domain, max_age_days)
+    with _lock:
+        entry = _entries.get(key)
+        write_count = _write_counts.get((app_id, user_id), 0)
+    if entry is not None and _is_fresh(entry[0]):
+        return entry[1]
+
+    result = compute()
+    with _lock:
+        if _write_counts.get((app_id, user_id), 0) == write_count:
+            _entries[key] = (time.monotonic() + ttl, result)
+    return result
+
+
+def invalidate_user(app_id: uuid.UUID, user_id: str) -> None:
+    """Drop cached merges for a user, and any expired entries along the way."""
+    now = time.monotonic()
+    with _lock:
+        _write_counts[(app_id, user_id)] = _write_counts.get((app_id, user_id), 0) + 1
+        stale = [
+            key for key, (expires_at, _) in _entries.items()
+            if expires_at <= now or (key[0] == app_id and key[1] == user_id)
+        ]
+        for key in stale:
+            del _entries[key]
+
+
+def clear() -> None:
+    """Drop all cached merges."""
+    with _lock:
+        _entries.clear()
+        _write_counts.clear()
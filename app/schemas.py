@@ -37,8 +37,31 @@ VALUE_SHAPES = {
 }
 
 
-class MemoryCreateRequest(BaseModel):
-    user_id: str = Field(..., description="Unique identifier for the user", examples=["user123"])
+def detect_value_shape(value_json: Union[Dict[str, Any], List[Any]]) -> Optional[str]:
+    """Return the VALUE_SHAPES name value_json matches, or None if it matches none."""
+    if isinstance(value_json, dict):
+        if "likes" in value_json or "dislikes" in value_json:
+            return "likes_dislikes"
+        if all(isinstance(v, bool) for v in value_json.values()):
+            return "boolean_flags"
+        if "windows" in value_json or "time_slots" in value_json:
+            return "schedule_windows"
+        if "focus_mode" in value_json or "do_not_disturb" in value_json:
+            return "attention_settings"
+        return "kv_map"
+    elif isinstance(value_json, list):
+        if len(value_json) > 0 and all(isinstance(item, str) for item in value_json):
+            return "rules_list"
+        if len(value_json) > 0 and all(
+            isinstance(item, dict) and ("start" in item or "end" in item or "day" in item)
+            for item in value_json
+        ):
+            return "schedule_windows"
+    return None
+
+
+class MemoryBase(BaseModel):
+    """Fields and validation shared by single and bulk memory creation."""
     scope: str = Field(..., description="Memory scope (preferences, constraints, communication, accessibility, schedule, attention)", examples=["preferences"])
     domain: Optional[str] = Field(None, description="Optional domain/sub-category within the scope", examples=["food", "music", "work"])
     source: str = Field(..., description="Source of the memory (explicit_user_input or user_setting)", examples=["explicit_user_input"])
@@ -64,34 +87,14 @@ class MemoryCreateRequest(BaseModel):
         return v
     
     @model_validator(mode="after")
-    def validate_value_shape(self) -> "MemoryCreateRequest":
-        value_json = self.value_json
-        shape = self._detect_shape(value_json)
-        if shape is None:
+    def validate_value_shape(self) -> "MemoryBase":
+        if detect_value_shape(self.value_json) is None:
             raise ValueError("value_json does not match any allowed shape")
         return self
-    
-    @staticmethod
-    def _detect_shape(value_json: Union[Dict[str, Any], List[Any]]) -> Optional[str]:
-        if isinstance(value_json, dict):
-            if "likes" in value_json or "dislikes" in value_json:
-                return "likes_dislikes"
-            if all(isinstance(v, bool) for v in value_json.values()):
-                return "boolean_flags"
-            if "windows" in value_json or "time_slots" in value_json:
-                return "schedule_windows"
-            if "focus_mode" in value_json or "do_not_disturb" in value_json:
-                return "attention_settings"
-            return "kv_map"
-        elif isinstance(value_json, list):
-            if len(value_json) > 0 and all(isinstance(item, str) for item in value_json):
-                return "rules_list"
-            if len(value_json) > 0 and all(
-                isinstance(item, dict) and ("start" in item or "end" in item or "day" in item)
-                for item in value_json
-            ):
-                return "schedule_windows"
-        return None
+
+
+class MemoryCreateRequest(MemoryBase):
+    user_id: str = Field(..., description="Unique identifier for the user", examples=["user123"])
     
     model_config = {
         "json_schema_extra": {
@@ -146,6 +149,44 @@ class MemoryCreateResponse(BaseModel):
     }
 
 
+class MemoryBulkCreateItem(MemoryBase):
+    """One memory in a bulk create; the user_id is given once for the whole request."""
+
+
+class MemoryBulkCreateRequest(BaseModel):
+    user_id: str = Field(..., description="Unique identifier for the user", examples=["user123"])
+    memories: List[MemoryBulkCreateItem] = Field(..., min_length=1, max_length=1000, description="Memories to create (1-1000)")
+    
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "user_id": "user123",
+                    "memories": [
+                        {
+                            "scope": "preferences",
+                            "domain": "food",
+                            "source": "explicit_user_input",
+                            "ttl_days": 30,
+                            "value_json": {"likes": ["pizza", "sushi"]}
+                        },
+                        {
+                            "scope": "constraints",
+                            "source": "explicit_user_input",
+                            "ttl_days": 90,
+                            "value_json": ["no meetings before 9am"]
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class MemoryBulkCreateResponse(BaseModel):
+    memories: List[MemoryCreateResponse] = Field(..., description="Created memories, in request order")
+
+
 class MemoryReadRequest(BaseModel):
     user_id: str = Field(..., description="Unique identifier for the user", examples=["user123"])
     scope: str = Field(..., description="Memory scope to read", examples=["preferences"])
@@ -201,6 +242,75 @@ class MemoryReadResponse(BaseModel):
     }
 
 
+class MemoryReadBatchItem(BaseModel):
+    scope: str = Field(..., description="Memory scope to read", examples=["preferences"])
+    domain: Optional[str] = Field(None, description="Optional domain filter", examples=["food"])
+    purpose: str = Field(..., description="Purpose for reading (used for policy enforcement)", examples=["generate personalized content"])
+    max_age_days: Optional[int] = Field(default=None, ge=1, description="Maximum age of memories to include (in days)", examples=[30, 90])
+    
+    @field_validator("scope")
+    @classmethod
+    def validate_scope(cls, v: str) -> str:
+        if v not in ALLOWED_SCOPES:
+            raise ValueError(f"scope must be one of {ALLOWED_SCOPES}")
+        return v
+
+
+class MemoryReadBatchRequest(BaseModel):
+    user_id: str = Field(..., description="Unique identifier for the user", examples=["user123"])
+    queries: List[MemoryReadBatchItem] = Field(..., min_length=1, max_length=100, description="Reads to perform (1-100)")
+    
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "user_id": "user123",
+                    "queries": [
+                        {"scope": "preferences", "purpose": "generate personalized content"},
+                        {"scope": "preferences", "domain": "food", "purpose": "generate personalized content"}
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class MemoryReadBatchResult(BaseModel):
+    read: Optional[MemoryReadResponse] = Field(None, description="Read result, or null if the read was denied")
+    error: Optional[str] = Field(None, description="Why the read was denied", examples=["Purpose class 'scheduling' not allowed for scope 'preferences'"])
+
+
+class MemoryReadBatchResponse(BaseModel):
+    results: List[MemoryReadBatchResult] = Field(..., description="One result per query, in request order")
+
+
+class MemoryReadMergedRequest(BaseModel):
+    user_id: str = Field(..., description="Unique identifier for the user", examples=["user123"])
+    scopes: List[str] = Field(..., min_length=1, max_length=len(ALLOWED_SCOPES), description="Scopes to read", examples=[["preferences", "constraints"]])
+    domains: List[str] = Field(default_factory=list, max_length=15, description="Domains to read within every scope, besides the unfiltered read (0-15)", examples=[["food", "travel"]])
+    purpose: str = Field(..., description="Purpose for reading (used for policy enforcement)", examples=["generate personalized content"])
+    max_age_days: Optional[int] = Field(default=None, ge=1, description="Maximum age of memories to include (in days)", examples=[30, 90])
+    
+    @field_validator("scopes")
+    @classmethod
+    def validate_scopes(cls, v: List[str]) -> List[str]:
+        for scope in v:
+            if scope not in ALLOWED_SCOPES:
+                raise ValueError(f"scope must be one of {ALLOWED_SCOPES}")
+        return v
+
+
+class MemoryReadMergedScope(BaseModel):
+    summary_struct: Dict[str, Any] = Field(..., description="Summaries of the scope's reads merged into one", examples=[{"likes": ["pizza", "sushi"], "dislikes": ["broccoli"]}])
+    confidence: float = Field(ge=0.0, le=1.0, description="Highest confidence among the scope's reads", examples=[0.85])
+    revocation_tokens: List[str] = Field(..., description="Tokens of the reads behind this scope, unfiltered read first")
+
+
+class MemoryReadMergedResponse(BaseModel):
+    scopes: Dict[str, MemoryReadMergedScope] = Field(..., description="Merged result per allowed scope, in request order")
+    denied: Dict[str, str] = Field(default_factory=dict, description="Why each denied scope was not read")
+
+
 class MemoryReadContinueRequest(BaseModel):
     revocation_token: str = Field(..., description="Revocation token from previous read", examples=["550e8400-e29b-41d4-a716-446655440000"])
     max_age_days: Optional[int] = Field(default=None, ge=1, description="Maximum age of memories to include (in days)", examples=[30])
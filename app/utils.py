@@ -1,5 +1,7 @@
 import bcrypt
+import copy
 import hashlib
+import json
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
@@ -443,3 +445,25 @@ def _merge_attention(memories: List[Dict[str, Any]]) -> Dict[str, Any]:
         "confidence": confidence,
     }
 
+
+def merge_summary_structs(structs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine several summary_structs for one scope (e.g. its unfiltered and per-domain reads).
+    
+    Keys are taken in order: a new key is added, lists under a shared key are
+    unioned (deduped by their JSON form, then sorted by it, so dict items such
+    as schedule windows work too), dicts are updated, and any other value
+    keeps the first one seen. The inputs are not modified.
+    """
+    merged: Dict[str, Any] = {}
+    for struct in structs:
+        for key, value in struct.items():
+            if key not in merged:
+                merged[key] = copy.deepcopy(value)
+            elif isinstance(merged[key], list) and isinstance(value, list):
+                items = {json.dumps(item, sort_keys=True, default=str): item for item in value}
+                items.update((json.dumps(item, sort_keys=True, default=str), item) for item in merged[key])
+                merged[key] = [copy.deepcopy(items[item_key]) for item_key in sorted(items)]
+            elif isinstance(merged[key], dict) and isinstance(value, dict):
+                merged[key].update(copy.deepcopy(value))
+    return merged
@@ -3,9 +3,11 @@
 import sys
 import os
 from datetime import datetime
+from decimal import Decimal
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import SubscriptionPlan
@@ -19,8 +21,8 @@ def seed_plans():
             {
                 "name": "free",
                 "display_name": "Free",
-                "price_monthly": 0,
-                "price_yearly": 0,
+                "price_monthly": Decimal("0.00"),
+                "price_yearly": Decimal("0.00"),
                 "requests_per_month": 10000,
                 "memories_limit": 1000,
                 "rate_limit_per_hour": 1000,
@@ -34,8 +36,8 @@ def seed_plans():
             {
                 "name": "pro",
                 "display_name": "Pro",
-                "price_monthly": 99.00,
-                "price_yearly": 990.00,
+                "price_monthly": Decimal("99.00"),
+                "price_yearly": Decimal("990.00"),
                 "requests_per_month": 100000,
                 "memories_limit": 1000000,
                 "rate_limit_per_hour": 10000,
@@ -50,8 +52,8 @@ def seed_plans():
             {
                 "name": "enterprise",
                 "display_name": "Enterprise",
-                "price_monthly": 999.00,
-                "price_yearly": 9990.00,
+                "price_monthly": Decimal("999.00"),
+                "price_yearly": Decimal("9990.00"),
                 "requests_per_month": -1,  # Unlimited
                 "memories_limit": -1,  # Unlimited
                 "rate_limit_per_hour": 100000,
@@ -65,14 +67,20 @@ def seed_plans():
             },
         ]
         
+        names = [plan_data["name"] for plan_data in plans]
+        existing = {
+            name for (name,) in
+            db.query(SubscriptionPlan.name).filter(SubscriptionPlan.name.in_(names))
+        }
+        missing = [plan_data for plan_data in plans if plan_data["name"] not in existing]
+        
+        if missing:
+            db.execute(insert(SubscriptionPlan), missing)
         for plan_data in plans:
-            existing = db.query(SubscriptionPlan).filter(SubscriptionPlan.name == plan_data["name"]).first()
-            if not existing:
-                plan = SubscriptionPlan(**plan_data)
-                db.add(plan)
-                print(f"✅ Created {plan_data['display_name']} plan")
-            else:
+            if plan_data["name"] in existing:
                 print(f"✓ {plan_data['display_name']} plan already exists")
+            else:
+                print(f"✅ Created {plan_data['display_name']} plan")
         
         db.commit()
         print("\n✅ Subscription plans seeded successfully!")
@@ -1,7 +1,12 @@
 """
 API client for interacting with the Memory Scope API.
 """
+from functools import lru_cache
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 
@@ -11,14 +16,33 @@ from test_app.config import config
 class MemoryAPIClient:
     """Client for interacting with the Memory Scope API."""
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, pool_maxsize: int = 32):
         """Initialize API client."""
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        # Bodies are sent pre-encoded with orjson, so the content type is set here
         self.headers = {
             "X-API-Key": api_key,
             "Content-Type": "application/json"
         }
+        
+        # One keep-alive session per client so calls reuse connections; the pool
+        # is sized for callers running many requests from worker threads.
+        # Retry's default allowed_methods excludes POST, so only connection
+        # failures (never a non-idempotent write that reached the server) are retried.
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+    
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
     
     def store_memory(
         self,
@@ -46,9 +70,37 @@ class MemoryAPIClient:
         if domain:
             payload["domain"] = domain
         
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self._session.post(url, data=orjson.dumps(payload))
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+    
+    def store_memories_bulk(
+        self,
+        user_id: str,
+        memories: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Store several memories for one user in a single request (POST /memory/bulk).
+        
+        Each memory is a dict with scope, value_json and optionally domain,
+        source (default explicit_user_input) and ttl_days (default 30). The
+        server accepts up to 1000 per call and creates all or none.
+        
+        Returns:
+            Response data with a memories list, in request order
+        """
+        url = f"{self.base_url}/memory/bulk"
+        payload = {
+            "user_id": user_id,
+            "memories": [
+                {"source": "explicit_user_input", "ttl_days": 30, **memory}
+                for memory in memories
+            ]
+        }
+        
+        response = self._session.post(url, data=orjson.dumps(payload))
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     def read_memory(
         self,
@@ -56,11 +108,16 @@ class MemoryAPIClient:
         scope: str,
         purpose: str,
         domain: Optional[str] = None,
-        max_age_days: Optional[int] = None
+        max_age_days: Optional[int] = None,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Read memories with policy enforcement.
         
+        If the server's read cache is enabled (it is off unless
+        read_cache_ttl_seconds is set, and is per-process), an identical read
+        made within its TTL reuses the merge; bypass_cache forces a fresh one.
+        
         Returns:
             Response data with summary_text, summary_struct, confidence, revocation_token, expires_at
         """
@@ -75,9 +132,75 @@ class MemoryAPIClient:
         if max_age_days:
             payload["max_age_days"] = max_age_days
         
-        response = requests.post(url, json=payload, headers=self.headers)
+        headers = {"X-Bypass-Cache": "1"} if bypass_cache else None
+        response = self._session.post(url, data=orjson.dumps(payload), headers=headers)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+    
+    def read_memory_batch(
+        self,
+        user_id: str,
+        specs: List[Dict[str, Any]],
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Perform several reads for one user in a single request (POST /memory/read/batch).
+        
+        Each spec is a dict with scope, purpose and optionally domain and
+        max_age_days. The server accepts up to 100 per call.
+        
+        Returns:
+            Response data with a results list in spec order; each result has a
+            read (as returned by read_memory) or an error if the read was denied
+        """
+        url = f"{self.base_url}/memory/read/batch"
+        payload = {
+            "user_id": user_id,
+            "queries": [
+                {k: v for k, v in spec.items() if v is not None}
+                for spec in specs
+            ]
+        }
+        
+        headers = {"X-Bypass-Cache": "1"} if bypass_cache else None
+        response = self._session.post(url, data=orjson.dumps(payload), headers=headers)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def read_memory_merged(
+        self,
+        user_id: str,
+        scopes: List[str],
+        purpose: str,
+        domains: Optional[List[str]] = None,
+        max_age_days: Optional[int] = None,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Read several scopes across domains, merged per scope (POST /memory/read/merged).
+        
+        Each scope is read unfiltered and within each of up to 15 domains; the
+        server merges a scope's summaries into one. A scope whose purpose is
+        denied is listed under denied instead.
+        
+        Returns:
+            Response data with scopes ({scope: {summary_struct, confidence,
+            revocation_tokens}}) and denied ({scope: reason})
+        """
+        url = f"{self.base_url}/memory/read/merged"
+        payload = {
+            "user_id": user_id,
+            "scopes": scopes,
+            "domains": domains or [],
+            "purpose": purpose
+        }
+        if max_age_days:
+            payload["max_age_days"] = max_age_days
+        
+        headers = {"X-Bypass-Cache": "1"} if bypass_cache else None
+        response = self._session.post(url, data=orjson.dumps(payload), headers=headers)
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     def continue_read_memory(
         self,
@@ -97,9 +220,9 @@ class MemoryAPIClient:
         if max_age_days:
             payload["max_age_days"] = max_age_days
         
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self._session.post(url, data=orjson.dumps(payload))
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def revoke_memory(self, revocation_token: str) -> Dict[str, Any]:
         """
@@ -113,14 +236,24 @@ class MemoryAPIClient:
             "revocation_token": revocation_token
         }
         
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self._session.post(url, data=orjson.dumps(payload))
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def health_check(self) -> Dict[str, Any]:
         """Check API health."""
         url = f"{self.base_url}/healthz"
-        response = requests.get(url)
+        response = self._session.get(url)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+
 
+@lru_cache(maxsize=None)
+def get_api_client(base_url: Optional[str] = None, api_key: Optional[str] = None) -> MemoryAPIClient:
+    """
+    Return the shared client for base_url/api_key (defaults from config).
+    
+    Clients are cached per argument pair so their connection pools survive
+    across calls and repeated imports.
+    """
+    return MemoryAPIClient(base_url or config.api_base_url, api_key or config.api_key)
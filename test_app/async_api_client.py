@@ -0,0 +1,215 @@
+"""
+Async API client for the Memory Scope API.
+
+Mirrors the write/read calls of MemoryAPIClient on an httpx.AsyncClient, so
+independent requests (e.g. for different users) can be awaited concurrently
+from the test runners' event loop.
+"""
+import asyncio
+from typing import Dict, Any, Optional, List, Union
+
+import httpx
+import orjson
+
+
+class AsyncMemoryAPIClient:
+    """
+    Async client for the Memory Scope API.
+    
+    One pooled httpx.AsyncClient per instance; at most max_concurrency
+    requests are in flight at once. Create it inside the event loop that
+    uses it and close it with aclose() or ``async with``.
+    """
+    
+    def __init__(self, base_url: str, api_key: str, max_concurrency: int = 16):
+        """Initialize API client."""
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._client = httpx.AsyncClient(
+            headers={"X-API-Key": api_key, "Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            timeout=30,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def __aenter__(self) -> "AsyncMemoryAPIClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+    
+    async def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        async with self._semaphore:
+            response = await self._client.post(f"{self.base_url}{path}", content=orjson.dumps(payload), headers=headers)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def store_memory(
+        self,
+        user_id: str,
+        scope: str,
+        value_json: Union[Dict[str, Any], List[Any]],
+        domain: Optional[str] = None,
+        source: str = "explicit_user_input",
+        ttl_days: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Store a memory.
+        
+        Returns:
+            Response data with memory ID, user_id, scope, created_at, expires_at
+        """
+        payload = {
+            "user_id": user_id,
+            "scope": scope,
+            "value_json": value_json,
+            "source": source,
+            "ttl_days": ttl_days
+        }
+        if domain:
+            payload["domain"] = domain
+        return await self._post("/memory", payload)
+    
+    async def store_memories_bulk(
+        self,
+        user_id: str,
+        memories: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Store several memories for one user in a single request (POST /memory/bulk).
+        
+        See MemoryAPIClient.store_memories_bulk for the memory fields.
+        
+        Returns:
+            Response data with a memories list, in request order
+        """
+        payload = {
+            "user_id": user_id,
+            "memories": [
+                {"source": "explicit_user_input", "ttl_days": 30, **memory}
+                for memory in memories
+            ]
+        }
+        return await self._post("/memory/bulk", payload)
+    
+    async def read_memory(
+        self,
+        user_id: str,
+        scope: str,
+        purpose: str,
+        domain: Optional[str] = None,
+        max_age_days: Optional[int] = None,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Read memories with policy enforcement.
+        
+        If the server's read cache is enabled (it is off unless
+        read_cache_ttl_seconds is set, and is per-process), an identical read
+        made within its TTL reuses the merge; bypass_cache forces a fresh one.
+        
+        Returns:
+            Response data with summary_text, summary_struct, confidence, revocation_token, expires_at
+        """
+        payload = {
+            "user_id": user_id,
+            "scope": scope,
+            "purpose": purpose
+        }
+        if domain:
+            payload["domain"] = domain
+        if max_age_days:
+            payload["max_age_days"] = max_age_days
+        headers = {"X-Bypass-Cache": "1"} if bypass_cache else None
+        return await self._post("/memory/read", payload, headers=headers)
+    
+    async def read_memory_batch(
+        self,
+        user_id: str,
+        specs: List[Dict[str, Any]],
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Perform several reads for one user in a single request (POST /memory/read/batch).
+        
+        See MemoryAPIClient.read_memory_batch for the spec fields.
+        
+        Returns:
+            Response data with a results list in spec order
+        """
+        payload = {
+            "user_id": user_id,
+            "queries": [
+                {k: v for k, v in spec.items() if v is not None}
+                for spec in specs
+            ]
+        }
+        headers = {"X-Bypass-Cache": "1"} if bypass_cache else None
+        return await self._post("/memory/read/batch", payload, headers=headers)
+    
+    async def read_memory_merged(
+        self,
+        user_id: str,
+        scopes: List[str],
+        purpose: str,
+        domains: Optional[List[str]] = None,
+        max_age_days: Optional[int] = None,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Read several scopes across domains, merged per scope (POST /memory/read/merged).
+        
+        See MemoryAPIClient.read_memory_merged.
+        
+        Returns:
+            Response data with scopes (merged result per allowed scope) and denied
+        """
+        payload = {
+            "user_id": user_id,
+            "scopes": scopes,
+            "domains": domains or [],
+            "purpose": purpose
+        }
+        if max_age_days:
+            payload["max_age_days"] = max_age_days
+        headers = {"X-Bypass-Cache": "1"} if bypass_cache else None
+        return await self._post("/memory/read/merged", payload, headers=headers)
+    
+    async def continue_read_memory(
+        self,
+        revocation_token: str,
+        max_age_days: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Continue reading memories using a revocation token.
+        
+        Returns:
+            Response data with summary_text, summary_struct, confidence, revocation_token, expires_at
+        """
+        payload = {
+            "revocation_token": revocation_token
+        }
+        if max_age_days:
+            payload["max_age_days"] = max_age_days
+        return await self._post("/memory/read/continue", payload)
+    
+    async def revoke_memory(self, revocation_token: str) -> Dict[str, Any]:
+        """
+        Revoke memory access using a revocation token.
+        
+        Returns:
+            Response data with revoked (bool) and revoked_at (datetime)
+        """
+        payload = {
+            "revocation_token": revocation_token
+        }
+        return await self._post("/memory/revoke", payload)
@@ -16,8 +16,16 @@ class TestAppConfig(BaseSettings):
     # OpenAI Configuration
     openai_api_key: Optional[str] = None  # Can be set via OPENAI_API_KEY env var
     openai_model: str = "gpt-4o-mini"  # Use cheaper model for test data generation
+    max_concurrent_requests: int = 8  # OpenAI requests in flight at once
+    requests_per_minute: int = 500  # Client-side RPM cap (match your account tier)
+    tokens_per_minute: int = 200000  # Client-side TPM cap, using estimated prompt + max_tokens
+    openai_cache_path: Optional[str] = None  # e.g. ".openai_cache" to reuse generated values across runs
+    profile_cache_path: Optional[str] = None  # e.g. "test_app/.profile_cache.json" to reuse user profiles across runs
+    answer_cache_path: Optional[str] = None  # e.g. ".answer_cache" to reuse profile-test answers for paraphrased questions
     
     # Test Configuration
+    max_concurrent_stores: int = 4  # Memory API store calls in flight at once
+    api_requests_per_minute: int = 600  # Client-side RPM cap on TestRunner's Memory API calls
     num_test_users: int = 5
     memories_per_user: int = 20
     test_scopes: list[str] = [
@@ -4,13 +4,14 @@ Example usage of the test app components.
 
 This demonstrates how to use the API client and data generator separately.
 """
+import asyncio
 import os
 import sys
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from test_app.api_client import MemoryAPIClient
+from test_app.api_client import get_api_client
 from test_app.openai_client import OpenAIDataGenerator
 
 
@@ -22,12 +23,12 @@ def example_basic_usage():
     api_url = os.getenv("MEMORY_API_URL", "http://localhost:8000")
     
     # Initialize clients
-    api = MemoryAPIClient(api_url, api_key)
+    api = get_api_client(api_url, api_key)
     generator = OpenAIDataGenerator(openai_key)
     
     # Generate a realistic memory
     print("Generating realistic preference memory...")
-    value_json = generator.generate_memory_value("preferences", domain="food")
+    value_json = asyncio.run(generator.generate_memory_value("preferences", domain="food"))
     print(f"Generated value: {value_json}")
     
     # Store it
@@ -0,0 +1,125 @@
+"""
+Parsers for the generator's JSON replies, one per value shape.
+
+Each shape is described once as a type and compiled into a pydantic
+TypeAdapter at import, so a reply is decoded and checked against its shape
+in a single pass of pydantic-core's validator. A reply that doesn't fit
+raises ValueError (pydantic's ValidationError is one, as is a JSON decode
+error), which the generator treats as a reason to re-ask. Validation is
+strict: no coercing "true" to True or 1 to "1".
+"""
+from typing import Any, Callable, Dict, List, Sequence
+
+import orjson
+from pydantic import Field, TypeAdapter
+from typing_extensions import Annotated, TypedDict
+
+
+class _LikesDislikes(TypedDict, total=False):
+    likes: List[str]
+    dislikes: List[str]
+
+
+class _Window(TypedDict):
+    day: str
+    start: str
+    end: str
+
+
+_RulesList = Annotated[List[str], Field(min_length=1)]
+_ScheduleWindows = Annotated[List[_Window], Field(min_length=1)]
+_NonEmptyObject = Annotated[Dict[str, Any], Field(min_length=1)]
+
+
+# Array shapes come back wrapped in an object, see openai_client._array_format
+class _WrappedRules(TypedDict):
+    rules: _RulesList
+
+
+class _WrappedWindows(TypedDict):
+    windows: _ScheduleWindows
+
+
+SCHEMAS: Dict[str, Any] = {
+    "likes_dislikes": _LikesDislikes,
+    "rules_list": _RulesList,
+    "schedule_windows": _ScheduleWindows,
+    "boolean_flags": Annotated[Dict[str, bool], Field(min_length=1)],
+    "attention_settings": _NonEmptyObject,
+    "kv_map": _NonEmptyObject,
+}
+
+WRAPPED_SCHEMAS = {
+    "rules_list": ("rules", _WrappedRules),
+    "schedule_windows": ("windows", _WrappedWindows),
+}
+
+_ADAPTERS = {shape: TypeAdapter(schema) for shape, schema in SCHEMAS.items()}
+
+
+def _check_likes_dislikes(value: Dict[str, Any]) -> Dict[str, Any]:
+    if not value:
+        raise ValueError("expected likes and/or dislikes")
+    return value
+
+
+# Checks a TypedDict can't express, applied after validation
+_POST_CHECKS: Dict[str, Callable[[Any], Any]] = {
+    "likes_dislikes": _check_likes_dislikes,
+}
+
+
+def _make_validator(shape: str) -> Callable[[Any], Any]:
+    validate = _ADAPTERS[shape].validate_python
+    post_check = _POST_CHECKS.get(shape)
+    if post_check is None:
+        return lambda value: validate(value, strict=True)
+    return lambda value: post_check(validate(value, strict=True))
+
+
+def _make_parser(shape: str) -> Callable[[str], Any]:
+    post_check = _POST_CHECKS.get(shape, lambda value: value)
+    if shape in WRAPPED_SCHEMAS:
+        key, wrapper = WRAPPED_SCHEMAS[shape]
+        validate_json = TypeAdapter(wrapper).validate_json
+        return lambda buf: post_check(validate_json(buf, strict=True)[key])
+    validate_json = _ADAPTERS[shape].validate_json
+    return lambda buf: post_check(validate_json(buf, strict=True))
+
+
+# Validate an already-decoded value of each shape
+VALIDATORS: Dict[str, Callable[[Any], Any]] = {shape: _make_validator(shape) for shape in SCHEMAS}
+
+# Decode and validate a reply for each shape
+PARSERS: Dict[str, Callable[[str], Any]] = {shape: _make_parser(shape) for shape in SCHEMAS}
+
+
+def parse_items(buf: str, shape: str, count: int) -> List[Any]:
+    """Parse an {"items": [...]} reply holding at least `count` values of one shape."""
+    value = orjson.loads(buf)
+    items = value.get("items") if isinstance(value, dict) else None
+    if not isinstance(items, list) or len(items) < count:
+        raise ValueError(f"expected an 'items' array of {count} {shape} values")
+    validate = VALIDATORS[shape]
+    return [validate(item) for item in items[:count]]
+
+
+def parse_mixed_items(buf: str, shapes: Sequence[str]) -> List[Any]:
+    """Parse an {"items": [...]} reply holding one value per shape, in order."""
+    value = orjson.loads(buf)
+    items = value.get("items") if isinstance(value, dict) else None
+    if not isinstance(items, list) or len(items) < len(shapes):
+        raise ValueError(f"expected an 'items' array of {len(shapes)} values")
+    return [VALIDATORS[shape](item) for shape, item in zip(shapes, items)]
+
+
+def parse_profiles(buf: str, count: int) -> List[str]:
+    """Parse a {"profiles": [...]} reply holding at least `count` non-empty profile strings."""
+    value = orjson.loads(buf)
+    profiles = value.get("profiles") if isinstance(value, dict) else None
+    if not isinstance(profiles, list) or len(profiles) < count:
+        raise ValueError(f"expected a 'profiles' array of {count} strings")
+    profiles = profiles[:count]
+    if not all(isinstance(profile, str) and profile.strip() for profile in profiles):
+        raise ValueError("profiles must be non-empty strings")
+    return [profile.strip() for profile in profiles]
@@ -6,14 +6,125 @@ This script uses OpenAI to intelligently extract memories from a detailed profil
 import sys
 import os
 import json
+import asyncio
 from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+
+import orjson
+import requests
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from test_app.api_client import MemoryAPIClient
+from app.sanitization import sanitize_domain
+from app.schemas import detect_value_shape
+from test_app.api_client import MemoryAPIClient, get_api_client
 from test_app.config import config
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+MemoryScope = Literal["preferences", "constraints", "communication", "accessibility", "schedule", "attention"]
+
+
+class ExtractedMemory(BaseModel):
+    """
+    One memory as returned by the extractor, checked before it is stored.
+    
+    Applies the server's own domain and value-shape rules, so an item the
+    API would reject is dropped here instead of failing its bulk batch.
+    """
+    
+    scope: MemoryScope
+    domain: Optional[str] = None
+    value: Union[Dict[str, Any], List[Any]]
+    
+    @field_validator("domain")
+    @classmethod
+    def validate_domain(cls, v: Optional[str]) -> Optional[str]:
+        return sanitize_domain(v)
+    
+    @field_validator("value")
+    @classmethod
+    def validate_value(cls, v: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str, Any], List[Any]]:
+        if not v:
+            raise ValueError("value must not be empty")
+        return v
+    
+    @model_validator(mode="after")
+    def validate_value_shape(self) -> "ExtractedMemory":
+        if detect_value_shape(self.value) is None:
+            raise ValueError("value does not match any allowed shape")
+        return self
+
+
+def clean_extracted_memories(memories: list) -> List[ExtractedMemory]:
+    """
+    Drop invalid and duplicate extracted memories, keeping first-seen order.
+    
+    Duplicates are matched on scope, domain and value (key order ignored),
+    so they never cost an API round-trip.
+    """
+    cleaned: Dict[tuple, ExtractedMemory] = {}
+    for raw in memories:
+        try:
+            memory = ExtractedMemory.model_validate(raw)
+        except ValidationError:
+            continue
+        key = (memory.scope, memory.domain, json.dumps(memory.value, sort_keys=True))
+        cleaned.setdefault(key, memory)
+    return list(cleaned.values())
+
+
+# Most memories the bulk endpoint accepts per request
+BULK_STORE_SIZE = 1000
+
+
+def _store_request(memory: ExtractedMemory) -> Dict[str, Any]:
+    """The store request body fields for one extracted memory."""
+    return {
+        "scope": memory.scope,
+        "domain": memory.domain,
+        "source": "explicit_user_input",
+        "ttl_days": 365,
+        "value_json": memory.value,
+    }
+
+
+def _store_batch(api_client: MemoryAPIClient, user_id: str, batch: List[ExtractedMemory]) -> Tuple[int, int]:
+    """
+    Store a batch with one bulk request and return (stored, failed).
+    
+    The server creates a bulk batch all-or-nothing, so if it rejects the
+    batch (400/422) the memories are stored one at a time instead, and
+    only the ones rejected individually count as failed.
+    """
+    try:
+        response = api_client.store_memories_bulk(
+            user_id=user_id,
+            memories=[_store_request(memory) for memory in batch]
+        )
+        print(f"      ✓ Stored {len(response['memories'])} memories")
+        return len(response["memories"]), 0
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code not in (400, 422):
+            print(f"      ✗ Failed: {e}")
+            return 0, len(batch)
+        print(f"      ⚠ Batch rejected ({e}); storing one at a time")
+    except Exception as e:
+        print(f"      ✗ Failed: {e}")
+        return 0, len(batch)
+    
+    stored = failed = 0
+    for memory in batch:
+        try:
+            api_client.store_memory(user_id=user_id, **_store_request(memory))
+            stored += 1
+        except Exception as e:
+            failed += 1
+            print(f"      ✗ Failed {memory.scope}/{memory.domain or 'no domain'}: {e}")
+    print(f"      ✓ Stored {stored} memories one at a time")
+    return stored, failed
+
 
 PROFILE = """I'm 38, born in a small coastal town and raised mostly by practical people who valued showing up over talking about feelings. My parents are still together. They're different in every way, which taught me early how compromise actually works, not the tidy version people describe. I'm close with my sister. We don't talk every day, but when we do it's honest and usually useful.
 
@@ -36,12 +147,12 @@ I'm not especially nostalgic, but I do think a lot about time. What compounds. W
 If there's a throughline, it's this: I care about systems, relationships, and decisions that hold up over time. I'm less interested in being impressive than in being useful, steady, and hard to knock over when things get messy."""
 
 
-def extract_memories_from_profile(profile_text: str, openai_client: OpenAI) -> list:
-    """Extract structured memories from a profile using OpenAI."""
+async def _extract_from_paragraph(paragraph: str, openai_client: AsyncOpenAI) -> list:
+    """Extract structured memories from one profile paragraph."""
     prompt = f"""Analyze this detailed user profile and extract ALL relevant information as structured memories.
 
 Profile:
-{profile_text}
+{paragraph}
 
 Extract memories in this JSON format:
 {{
@@ -80,8 +191,8 @@ IMPORTANT RULES:
 Return ONLY valid JSON. Extract as many memories as needed to capture all the information."""
 
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o",
+        response = await openai_client.chat.completions.create(
+            model=config.openai_model,
             messages=[
                 {
                     "role": "system",
@@ -96,13 +207,29 @@ Return ONLY valid JSON. Extract as many memories as needed to capture all the in
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(response.choices[0].message.content)
+        # Structured outputs can't express the free-form value objects, so keep
+        # json_object mode; entries are validated later by clean_extracted_memories
+        result = orjson.loads(response.choices[0].message.content)
         return result.get("memories", [])
     except Exception as e:
         print(f"Error extracting memories: {e}")
         return []
 
 
+async def extract_memories_from_profile(profile_text: str, openai_client: AsyncOpenAI) -> list:
+    """
+    Extract structured memories from a profile using OpenAI.
+    
+    Each paragraph is extracted by its own request, all in flight at once,
+    and the partial memory lists are merged in paragraph order.
+    """
+    paragraphs = [p for p in profile_text.split("\n\n") if p.strip()]
+    results = await asyncio.gather(
+        *(_extract_from_paragraph(p, openai_client) for p in paragraphs)
+    )
+    return [memory for memories in results for memory in memories]
+
+
 def load_profile(user_id: str = "profile_test_user"):
     """Load the profile and store all extracted memories."""
     print("Loading profile and extracting memories...")
@@ -110,54 +237,35 @@ def load_profile(user_id: str = "profile_test_user"):
     print()
     
     # Initialize clients
-    api_client = MemoryAPIClient(
-        base_url=config.api_base_url,
-        api_key=config.api_key
-    )
-    openai_client = OpenAI(api_key=config.openai_api_key)
+    api_client = get_api_client()
+    openai_client = AsyncOpenAI(api_key=config.openai_api_key)
     
     # Extract memories
     print("Extracting memories from profile...")
-    memories = extract_memories_from_profile(PROFILE, openai_client)
+    memories = asyncio.run(extract_memories_from_profile(PROFILE, openai_client))
     print(f"Extracted {len(memories)} memories")
+    extracted_count = len(memories)
+    memories = clean_extracted_memories(memories)
+    skipped_count = extracted_count - len(memories)
+    if skipped_count:
+        print(f"Skipped {skipped_count} invalid or duplicate memories")
     print()
     
-    # Store memories
+    # Store memories with one bulk request per batch
     stored_count = 0
     failed_count = 0
-    
-    for i, memory in enumerate(memories, 1):
-        try:
-            scope = memory.get("scope")
-            domain = memory.get("domain")
-            value = memory.get("value")
-            
-            if not scope or not value:
-                print(f"  [{i}] Skipping invalid memory (missing scope or value)")
-                failed_count += 1
-                continue
-            
-            print(f"  [{i}] Storing {scope}/{domain or 'no domain'}: {json.dumps(value)[:80]}...")
-            
-            response = api_client.create_memory(
-                user_id=user_id,
-                scope=scope,
-                domain=domain,
-                source="explicit_user_input",
-                ttl_days=365,
-                value_json=value
-            )
-            
-            stored_count += 1
-            print(f"      ✓ Stored (ID: {response['id'][:8]}...)")
-            
-        except Exception as e:
-            print(f"      ✗ Failed: {e}")
-            failed_count += 1
+    for batch_start in range(0, len(memories), BULK_STORE_SIZE):
+        batch = memories[batch_start:batch_start + BULK_STORE_SIZE]
+        for i, memory in enumerate(batch, batch_start + 1):
+            print(f"  [{i}] Storing {memory.scope}/{memory.domain or 'no domain'}: {json.dumps(memory.value)[:80]}...")
+        stored, failed = _store_batch(api_client, user_id, batch)
+        stored_count += stored
+        failed_count += failed
     
     print()
     print(f"Summary:")
-    print(f"  Total extracted: {len(memories)}")
+    print(f"  Total extracted: {extracted_count}")
+    print(f"  Skipped (invalid or duplicate): {skipped_count}")
     print(f"  Successfully stored: {stored_count}")
     print(f"  Failed: {failed_count}")
     print()
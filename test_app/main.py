@@ -8,14 +8,12 @@ all API endpoints: store, read, continue read, and revoke.
 import sys
 import os
 import argparse
+import asyncio
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from test_app.config import config
-from test_app.api_client import MemoryAPIClient
-from test_app.openai_client import OpenAIDataGenerator
-from test_app.test_runner import TestRunner
 
 
 def main():
@@ -76,6 +74,12 @@ def main():
             print("Error: OpenAI API key is required.")
             sys.exit(1)
     
+    # Imported only once the arguments are valid, so --help and argument
+    # errors don't pay for loading the OpenAI SDK
+    from test_app.api_client import MemoryAPIClient
+    from test_app.openai_client import OpenAIDataGenerator
+    from test_app.test_runner import TestRunner
+    
     # Initialize clients
     print("Initializing clients...")
     api_client = MemoryAPIClient(args.api_url, api_key)
@@ -85,12 +89,17 @@ def main():
     # Create test runner
     runner = TestRunner(api_client, data_generator)
     
+    async def run_tests():
+        # One event loop for the whole run; the generator's client lives in it
+        async with data_generator:
+            await runner.run_all_tests(
+                num_users=args.users,
+                memories_per_user=args.memories
+            )
+    
     # Run tests
     try:
-        runner.run_all_tests(
-            num_users=args.users,
-            memories_per_user=args.memories
-        )
+        asyncio.run(run_tests())
     except KeyboardInterrupt:
         print("\n\nTest interrupted by user.")
         runner._print_summary()
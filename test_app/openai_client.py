@@ -1,278 +1,602 @@
 """
 OpenAI client for generating realistic test data.
 """
-import json
+import asyncio
 import random
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
+import shelve
+import weakref
+from functools import lru_cache, partial
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+import httpx
+import orjson
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
 
 from test_app.config import config
+from test_app.fast_parsers import PARSERS, parse_items, parse_mixed_items, parse_profiles
+from test_app.rate_limiter import AsyncTokenBucket
+
+# Attempts per completion, with exponential backoff (1s, 2s, 4s, ... capped)
+# between them; also bounds re-asks after a reply that isn't valid JSON
+RETRY_ATTEMPTS = 5
+RETRY_MAX_WAIT = 30
+
+# Failures worth retrying: 429s, 5xx, and connection errors/timeouts
+# (APITimeoutError is an APIConnectionError)
+TRANSIENT_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
+
+# JSON mode: the model is constrained to return a single JSON object
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+
+def _array_format(name: str, key: str, items: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Structured-output format for an array-shaped value.
+    
+    Both JSON mode and strict schemas need an object at the top level, so
+    the array is returned under `key` and unwrapped by the shape's parser.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {key: {"type": "array", "items": items}},
+                "required": [key],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+RULES_LIST_FORMAT = _array_format("rules_list", "rules", {"type": "string"})
+SCHEDULE_WINDOWS_FORMAT = _array_format("schedule_windows", "windows", {
+    "type": "object",
+    "properties": {
+        "day": {"type": "string"},
+        "start": {"type": "string"},
+        "end": {"type": "string"},
+    },
+    "required": ["day", "start", "end"],
+    "additionalProperties": False,
+})
+
+# Shapes without an entry here use JSON_OBJECT_FORMAT
+RESPONSE_FORMATS = {
+    "rules_list": RULES_LIST_FORMAT,
+    "schedule_windows": SCHEDULE_WINDOWS_FORMAT,
+}
+
+# Values per multi-output completion (generate_memory_values_bulk and
+# generate_memory_values_batch); larger
+# groups are split so replies stay short and the pieces run concurrently
+BULK_GENERATE_SIZE = 10
+
+# Value shapes the API accepts for each scope; other scopes use DEFAULT_SHAPES
+SHAPES_BY_SCOPE = {
+    "preferences": ("likes_dislikes", "kv_map"),
+    "constraints": ("rules_list", "kv_map"),
+    "communication": ("kv_map",),
+    "accessibility": ("boolean_flags", "kv_map"),
+    "schedule": ("schedule_windows",),
+    "attention": ("attention_settings", "kv_map"),
+}
+DEFAULT_SHAPES = ("kv_map",)
+
+# Completion budget (max_tokens) per value, sized to the item counts the
+# system prompt asks for (e.g. up to 8 likes + 8 dislikes, up to 5 windows of ~25
+# tokens) with some headroom. Output tokens are decoded one at a time, so a
+# tight cap bounds latency; a reply cut short is re-asked by _call_json.
+TOKEN_BUDGETS = {
+    "likes_dislikes": 140,
+    "rules_list": 160,
+    "schedule_windows": 160,
+    "boolean_flags": 100,
+    "attention_settings": 100,
+    "kv_map": 110,
+}
+
+# One system prompt for every value request, describing all shapes. It is
+# identical across requests and longer than 1024 tokens, so OpenAI's
+# automatic prompt caching serves it from cache after the first request.
+SYSTEM_MESSAGE = {"role": "system", "content": """You are a helpful assistant that generates realistic user memory data for testing a personal-memory API. Each memory stores one thing an assistant has learned about a user, and its value must be valid JSON in one of the shapes described below. Always return valid JSON only: no markdown, no code fences, no comments, no explanation before or after.
+
+## Requests
+
+Every user message is a JSON object such as:
+{"shape": "likes_dislikes", "scope": "preferences", "domain": "food"}
+
+- "shape" is the value shape to generate (see "Shapes").
+- "scope" is the kind of memory (see "Scopes"). Make the value fit it.
+- "domain" is an optional topic such as food, work, entertainment, health or travel. When it is present, every item must relate to that domain; when it is null, choose any plausible everyday topic.
+- "count", when present, asks for several values at once. Return {"items": [<value>, <value>, ...]} with exactly that many values of the requested shape, each one complete on its own and clearly different from the others (different items, keys, days or settings, not the same value reworded). Inside "items", rules_list and schedule_windows values are bare arrays, without their "rules"/"windows" wrapper.
+
+- "requests", when present instead of the fields above, is an array of requests that may differ in shape, scope and domain, e.g. {"requests": [{"shape": "kv_map", "scope": "communication", "domain": null}, {"shape": "rules_list", "scope": "constraints", "domain": "travel"}]}. Return {"items": [<value>, <value>, ...]} with exactly one value per request, in the same order, each following its own request's shape, scope and domain. Values for identical requests must still differ from each other. The same unwrapping rule as for "count" applies.
+
+Without "count" or "requests", return a single value of the requested shape as described below.
+
+## Scopes
+
+- preferences: what the user likes, dislikes, or prefers (cuisines, music genres, travel styles, tools, brands).
+- constraints: rules and limits the user lives by (budgets, dietary restrictions, meeting limits, things to never suggest).
+- communication: how the user wants to be addressed and contacted (tone, language, verbosity, channels, formatting).
+- accessibility: needs that affect how content is presented (font size, contrast, captions, screen readers, reduced motion).
+- schedule: when the user is available, busy, or prefers certain activities (working hours, gym slots, quiet times).
+- attention: how and when the user wants to be interrupted (focus mode, do-not-disturb, notification sounds and batching).
+
+## Domains
+
+- food: dishes, cuisines, ingredients, restaurants, diets.
+- work: meetings, tools, working hours, collaboration habits.
+- entertainment: music, films, shows, games, books, live events.
+- health: exercise, sleep, dietary or medical needs, wellbeing routines.
+- travel: destinations, airlines, seats, hotels, budgets, trip pacing.
+
+## Shapes
+
+### likes_dislikes
+A JSON object with a "likes" array and a "dislikes" array of short strings. Include 3-8 items in each array. Items should be specific and realistic ("Thai green curry", "early morning flights"), not generic placeholders ("food", "item1").
+Example: {"likes": ["Neapolitan pizza", "sushi", "cold brew coffee"], "dislikes": ["cilantro", "overly sweet desserts", "loud restaurants"]}
+
+### rules_list
+A list of 3-6 rules or constraints, each a short imperative sentence. Because the reply must be a JSON object, return the list under a "rules" key.
+Example: {"rules": ["No meetings before 9am", "Keep hotel budget under $200 per night", "Never book red-eye flights"]}
+
+### schedule_windows
+A list of 2-5 time windows. Each window is an object with "day" (a lowercase weekday such as "monday"), "start" and "end" (24-hour "HH:MM" times, with start before end). Because the reply must be a JSON object, return the list under a "windows" key.
+Example: {"windows": [{"day": "monday", "start": "09:00", "end": "17:00"}, {"day": "saturday", "start": "10:00", "end": "12:30"}]}
+
+### boolean_flags
+A JSON object of 3-6 flags whose values are all true or false. Keys are snake_case names of concrete settings.
+Example: {"large_text": true, "high_contrast": false, "captions_enabled": true, "reduce_motion": true}
+
+### attention_settings
+A JSON object of 2-5 attention or focus settings. Include "focus_mode" and/or "do_not_disturb" as booleans; other settings may be strings, numbers or booleans.
+Example: {"focus_mode": true, "do_not_disturb": false, "notification_sound": "gentle", "batch_notifications_minutes": 30}
+
+### kv_map
+A JSON object of 3-6 key-value pairs. Keys are snake_case; use appropriate value types (strings, numbers, booleans). Do not use the keys "likes", "dislikes", "windows", "focus_mode" or "do_not_disturb", and do not make every value a boolean, since those belong to other shapes.
+Example: {"preferred_language": "en", "response_length": "concise", "max_budget_usd": 150, "prefers_emoji": false}
+
+## Quality
+
+- Values should read like they were learned from a real person: concrete, consistent with each other, and plausible for the scope and domain.
+- Vary the content between requests; do not reuse the examples above verbatim.
+- Keep strings short (a few words, or one sentence for rules).
+- Never include personal data such as real names, emails, phone numbers or addresses."""}
+
+PROFILE_MESSAGES = (
+    {"role": "system", "content": "You are a helpful assistant that generates realistic user profiles."},
+    {"role": "user", "content": """Generate a brief, realistic user profile (2-3 sentences) describing a person's general preferences and characteristics.
+This will be used to generate consistent test data.
+
+Return ONLY plain text, no JSON, no formatting."""},
+)
+PROFILES_PROMPT_TEMPLATE = """Generate %(count)d different, brief, realistic user profiles (2-3 sentences each), each describing a person's general preferences and characteristics.
+These will be used to generate consistent test data, so make the people clearly different from each other.
+
+Return a JSON object {"profiles": ["<profile>", ...]} with exactly %(count)d plain-text profiles."""
+
+
+@lru_cache(maxsize=512)
+def _user_message(value_shape: str, scope: str, domain: Optional[str], count: Optional[int] = None) -> Dict[str, str]:
+    """
+    Build the user message asking for one value of a shape, or `count`
+    values at once; cached, so repeats are a dict lookup.
+    """
+    request = {"shape": value_shape, "scope": scope, "domain": domain}
+    if count is not None:
+        request["count"] = count
+    return {"role": "user", "content": orjson.dumps(request).decode()}
+
+
+def _batch_user_message(specs: Sequence[Tuple[str, Optional[str], str]]) -> Dict[str, str]:
+    """Build the user message asking for one value per (scope, domain, value_shape) spec."""
+    requests = [{"shape": value_shape, "scope": scope, "domain": domain} for scope, domain, value_shape in specs]
+    return {"role": "user", "content": orjson.dumps({"requests": requests}).decode()}
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(api_key: Optional[str] = None) -> OpenAI:
+    """Return the shared OpenAI client for api_key (defaults to config.openai_api_key)."""
+    # Same keep-alive pool as the async clients, so callers on worker threads
+    # reuse warm connections instead of paying a TLS handshake each
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=config.max_concurrent_requests,
+            max_keepalive_connections=config.max_concurrent_requests,
+            keepalive_expiry=30,
+        ),
+        timeout=60,
+    )
+    return OpenAI(api_key=api_key or config.openai_api_key, http_client=http_client)
+
+
+# AsyncOpenAI clients (and their connection pools) only work on the event
+# loop they were first used on, so shared async clients are kept per loop and
+# dropped along with it
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_openai_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for api_key on the running event loop.
+    
+    Every generator on the same loop and key reuses one keep-alive pool.
+    """
+    api_key = api_key or config.openai_api_key
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(api_key)
+    if client is None:
+        # One keep-alive pool sized to the concurrency limit, so every request
+        # in flight reuses a warm connection instead of a new TLS handshake
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_concurrent_requests,
+                max_keepalive_connections=config.max_concurrent_requests,
+                keepalive_expiry=30,
+            ),
+            timeout=60,
+        )
+        # Retries are handled in _call, so they go back through the rate limits
+        client = clients[api_key] = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=0,
+            http_client=http_client,
+        )
+    return client
+
+
+async def close_async_openai_client(api_key: Optional[str] = None) -> None:
+    """Close and forget the shared AsyncOpenAI client for api_key on the running loop."""
+    api_key = api_key or config.openai_api_key
+    client = _async_clients.get(asyncio.get_running_loop(), {}).pop(api_key, None)
+    if client is not None:
+        await client.close()
+
+
+_Limits = Tuple[asyncio.Semaphore, AsyncTokenBucket, AsyncTokenBucket]
 
 
 class OpenAIDataGenerator:
-    """Generate realistic test data using OpenAI."""
+    """
+    Generate realistic test data using OpenAI.
+    
+    All generation methods are coroutines on an AsyncOpenAI client, so many
+    values can be requested concurrently (see generate_many). The client is
+    the shared one for the running event loop (get_async_openai_client), so
+    generators on one loop share a connection pool, and a generator can be
+    used from successive asyncio.run calls (its concurrency and rate limits
+    are likewise kept per loop). aclose() (or ``async with``)
+    closes the shared client for the current loop.
+    
+    With a cache path (config.openai_cache_path by default), generated values
+    are stored on disk per (model, scope, domain, value_shape) and reused
+    instead of calling the API again, including across runs.
+    """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[str] = None):
         """Initialize OpenAI client."""
-        self.client = OpenAI(api_key=api_key or config.openai_api_key)
+        self.api_key = api_key or config.openai_api_key
+        self._client: Optional[AsyncOpenAI] = None
         self.model = config.openai_model
+        # Concurrency and rate limits, created per event loop since their
+        # locks only work on the loop they were first used on
+        self._limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Limits]" = (
+            weakref.WeakKeyDictionary()
+        )
+        cache_path = cache_path or config.openai_cache_path
+        self._cache = shelve.open(cache_path) if cache_path else None
     
-    def generate_memory_value(
-        self, 
-        scope: str, 
-        domain: Optional[str] = None,
-        value_shape: Optional[str] = None
-    ) -> Dict[str, Any]:
+    def _loop_limits(self) -> _Limits:
+        """The semaphore and rate buckets for the running event loop."""
+        loop = asyncio.get_running_loop()
+        limits = self._limits.get(loop)
+        if limits is None:
+            # Smooth request arrival so large batches stay under the account's
+            # rate limits instead of collecting 429s
+            limits = self._limits[loop] = (
+                asyncio.Semaphore(config.max_concurrent_requests),
+                AsyncTokenBucket(config.requests_per_minute),
+                AsyncTokenBucket(config.tokens_per_minute),
+            )
+        return limits
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The AsyncOpenAI client; the loop's shared one unless one was assigned."""
+        return self._client or get_async_openai_client(self.api_key)
+    
+    @client.setter
+    def client(self, client: AsyncOpenAI) -> None:
+        self._client = client
+    
+    async def __aenter__(self) -> "OpenAIDataGenerator":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connections and the response cache."""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        if self._client is not None:
+            await self._client.close()
+        else:
+            await close_async_openai_client(self.api_key)
+    
+    async def _call(
+        self,
+        messages: Sequence[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
-        Generate a realistic memory value for the given scope.
+        Run one chat completion within the concurrency and rate limits; return its text.
+        
+        Transient failures are retried with exponential backoff, waiting
+        outside the concurrency limit so other requests can proceed.
+        """
+        # Rough token estimate (~4 characters per token); the completion's
+        # max_tokens counts against the TPM limit as well
+        estimated_tokens = sum(len(m["content"]) for m in messages) // 4 + max_tokens
+        extra = {"response_format": response_format} if response_format else {}
+        semaphore, request_bucket, token_bucket = self._loop_limits()
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                async with semaphore:
+                    await request_bucket.acquire()
+                    await token_bucket.acquire(estimated_tokens)
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **extra
+                    )
+                # Left unstripped: JSON replies go straight to orjson,
+                # which skips surrounding whitespace itself
+                return response.choices[0].message.content
+            except TRANSIENT_ERRORS:
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(min(RETRY_MAX_WAIT, 2 ** attempt))
+    
+    async def _call_json(
+        self,
+        messages: Sequence[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        parse: Callable[[str], Any],
+        response_format: Dict[str, Any] = JSON_OBJECT_FORMAT
+    ) -> Any:
+        """
+        Run a JSON-mode completion and return parse(reply).
+        
+        JSON mode can still yield an unparseable reply when the output is cut
+        off at max_tokens, or one in the wrong shape (parse raises
+        ValueError); it is shown back to the model with a request for the
+        requested JSON only, up to RETRY_ATTEMPTS times in all.
+        """
+        for attempt in range(RETRY_ATTEMPTS):
+            content = await self._call(messages, temperature, max_tokens, response_format)
+            try:
+                return parse(content)
+            except ValueError:  # includes JSON decode errors
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                messages = [
+                    *messages,
+                    {"role": "assistant", "content": content or ""},
+                    {"role": "user", "content": "Your last reply was not valid JSON in the requested format. Return only that JSON, nothing else."},
+                ]
+    
+    async def generate_many(
+        self,
+        specs: Sequence[Tuple[str, Optional[str]]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Generate memory values for many (scope, domain) specs concurrently.
+        
+        Specs that resolve to the same (scope, domain, value_shape) are
+        generated together with generate_memory_values_bulk; the remaining
+        one-off specs are packed into mixed completions with
+        generate_memory_values_batch. Neither applies when the response cache
+        is on (it would return one value for all identical specs anyway). A
+        failed multi-value call fails every spec in it.
         
         Args:
-            scope: Memory scope (preferences, constraints, etc.)
-            domain: Optional domain (food, work, etc.)
-            value_shape: Optional specific shape to generate
+            specs: (scope, domain) or (scope, domain, value_shape) tuples
+            return_exceptions: Return failures in place of their values
+                instead of raising the first one
             
         Returns:
-            Generated value_json that matches the API's expected shapes
+            Generated values (or exceptions), in the same order as specs
         """
-        # Determine which shapes are valid for this scope
-        if value_shape:
-            shapes = [value_shape]
-        else:
-            # Generate a random valid shape for this scope
-            if scope == "preferences":
-                shapes = ["likes_dislikes", "kv_map"]
-            elif scope == "constraints":
-                shapes = ["rules_list", "kv_map"]
-            elif scope == "communication":
-                shapes = ["kv_map"]
-            elif scope == "accessibility":
-                shapes = ["boolean_flags", "kv_map"]
-            elif scope == "schedule":
-                shapes = ["schedule_windows"]
-            elif scope == "attention":
-                shapes = ["attention_settings", "kv_map"]
-            else:
-                shapes = ["kv_map"]
-            
-            value_shape = random.choice(shapes)
+        if self._cache is not None:
+            return await asyncio.gather(
+                *(self.generate_memory_value(*spec) for spec in specs),
+                return_exceptions=return_exceptions
+            )
         
-        # Generate based on shape
-        if value_shape == "likes_dislikes":
-            return self._generate_likes_dislikes(scope, domain)
-        elif value_shape == "rules_list":
-            return self._generate_rules_list(scope, domain)
-        elif value_shape == "schedule_windows":
-            return self._generate_schedule_windows(scope, domain)
-        elif value_shape == "boolean_flags":
-            return self._generate_boolean_flags(scope, domain)
-        elif value_shape == "attention_settings":
-            return self._generate_attention_settings(scope, domain)
-        else:  # kv_map
-            return self._generate_kv_map(scope, domain)
-    
-    def _generate_likes_dislikes(self, scope: str, domain: Optional[str]) -> Dict[str, Any]:
-        """Generate likes/dislikes using OpenAI."""
-        prompt = f"""Generate a realistic JSON object with "likes" and "dislikes" arrays for a user's {scope} preferences.
-{f'Focus on the {domain} domain.' if domain else ''}
-
-Return ONLY valid JSON in this exact format:
-{{
-  "likes": ["item1", "item2", ...],
-  "dislikes": ["item1", "item2", ...]
-}}
-
-Make it realistic and specific. Include 3-8 items in each array."""
+        groups: Dict[Tuple[str, Optional[str], str], List[int]] = {}
+        for index, spec in enumerate(specs):
+            scope, domain = spec[0], spec[1]
+            value_shape = spec[2] if len(spec) > 2 and spec[2] else self._pick_shape(scope)
+            groups.setdefault((scope, domain, value_shape), []).append(index)
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates realistic user preference data. Always return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=200
-        )
+        # (call, spec indexes it fills), one call per completion
+        calls = []
+        singles = []
+        for key, indexes in groups.items():
+            if len(indexes) == 1:
+                singles.append((key, indexes[0]))
+                continue
+            scope, domain, value_shape = key
+            for start in range(0, len(indexes), BULK_GENERATE_SIZE):
+                chunk = indexes[start:start + BULK_GENERATE_SIZE]
+                calls.append((self.generate_memory_values_bulk(scope, value_shape, len(chunk), domain), chunk))
+        for start in range(0, len(singles), BULK_GENERATE_SIZE):
+            chunk = singles[start:start + BULK_GENERATE_SIZE]
+            calls.append((
+                self.generate_memory_values_batch([key for key, _ in chunk]),
+                [index for _, index in chunk],
+            ))
         
-        content = response.choices[0].message.content.strip()
-        # Extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        results = await asyncio.gather(
+            *(call for call, _ in calls),
+            return_exceptions=return_exceptions
+        )
         
-        return json.loads(content)
+        values: List[Any] = [None] * len(specs)
+        for (_, indexes), result in zip(calls, results):
+            for position, index in enumerate(indexes):
+                values[index] = result if isinstance(result, BaseException) else result[position]
+        return values
     
-    def _generate_rules_list(self, scope: str, domain: Optional[str]) -> List[str]:
-        """Generate rules list using OpenAI."""
-        prompt = f"""Generate a realistic list of rules/constraints for a user's {scope} preferences.
-{f'Focus on the {domain} domain.' if domain else ''}
-
-Return ONLY a valid JSON array of strings, like:
-["rule 1", "rule 2", "rule 3"]
-
-Make it realistic and specific. Include 3-6 rules."""
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates realistic user constraint data. Always return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=200
-        )
+    async def generate_memory_values_batch(
+        self,
+        specs: Sequence[Tuple[str, Optional[str], str]]
+    ) -> List[Any]:
+        """
+        Generate one value per (scope, domain, value_shape) spec in a single completion.
         
-        content = response.choices[0].message.content.strip()
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        Unlike generate_memory_values_bulk, the specs may all differ; each
+        value in the reply is checked against its own spec's shape.
         
-        return json.loads(content)
-    
-    def _generate_schedule_windows(self, scope: str, domain: Optional[str]) -> List[Dict[str, Any]]:
-        """Generate schedule windows using OpenAI."""
-        prompt = f"""Generate a realistic list of schedule time windows for a user's {scope} preferences.
-{f'Focus on the {domain} domain.' if domain else ''}
-
-Return ONLY valid JSON array of objects, like:
-[
-  {{"day": "monday", "start": "09:00", "end": "17:00"}},
-  {{"day": "tuesday", "start": "09:00", "end": "17:00"}}
-]
-
-Make it realistic. Include 2-5 time windows."""
+        Returns:
+            Generated values, in the same order as specs
+        """
+        specs = [
+            (scope, domain, value_shape if value_shape in TOKEN_BUDGETS else "kv_map")
+            for scope, domain, value_shape in specs
+        ]
+        if len(specs) == 1:
+            return [await self.generate_memory_value(*specs[0])]
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates realistic schedule data. Always return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
+        shapes = [value_shape for _, _, value_shape in specs]
+        return await self._call_json(
+            (SYSTEM_MESSAGE, _batch_user_message(specs)),
             temperature=0.8,
-            max_tokens=300
+            max_tokens=sum(TOKEN_BUDGETS[shape] for shape in shapes),
+            parse=partial(parse_mixed_items, shapes=shapes)
         )
-        
-        content = response.choices[0].message.content.strip()
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        return json.loads(content)
     
-    def _generate_boolean_flags(self, scope: str, domain: Optional[str]) -> Dict[str, Any]:
-        """Generate boolean flags using OpenAI."""
-        prompt = f"""Generate a realistic JSON object with boolean flags for a user's {scope} preferences.
-{f'Focus on the {domain} domain.' if domain else ''}
-
-Return ONLY valid JSON object with boolean values, like:
-{{
-  "flag1": true,
-  "flag2": false,
-  "flag3": true
-}}
-
-Make it realistic and specific. Include 3-6 flags."""
+    async def generate_memory_values_bulk(
+        self,
+        scope: str,
+        value_shape: str,
+        count: int,
+        domain: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Generate `count` independent values of one shape in a single completion.
+        
+        Args:
+            scope: Memory scope (preferences, constraints, etc.)
+            value_shape: Shape of every value
+            count: Number of values
+            domain: Optional domain (food, work, etc.)
+            
+        Returns:
+            List of `count` generated values
+        """
+        if count == 1:
+            return [await self.generate_memory_value(scope, domain, value_shape)]
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates realistic boolean flag data. Always return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
+        return await self._call_json(
+            (SYSTEM_MESSAGE, _user_message(value_shape, scope, domain, count)),
             temperature=0.8,
-            max_tokens=200
+            max_tokens=TOKEN_BUDGETS[value_shape] * count,
+            parse=partial(parse_items, shape=value_shape, count=count)
         )
-        
-        content = response.choices[0].message.content.strip()
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        return json.loads(content)
     
-    def _generate_attention_settings(self, scope: str, domain: Optional[str]) -> Dict[str, Any]:
-        """Generate attention settings using OpenAI."""
-        prompt = f"""Generate a realistic JSON object for attention/focus settings for a user's {scope} preferences.
-{f'Focus on the {domain} domain.' if domain else ''}
-
-Return ONLY valid JSON object, like:
-{{
-  "focus_mode": true,
-  "do_not_disturb": false,
-  "notification_sound": "gentle"
-}}
-
-Make it realistic. Include 2-5 settings."""
+    @staticmethod
+    def _pick_shape(scope: str) -> str:
+        """Pick a random value shape that is valid for the scope."""
+        return random.choice(SHAPES_BY_SCOPE.get(scope, DEFAULT_SHAPES))
+    
+    async def generate_memory_value(
+        self, 
+        scope: str, 
+        domain: Optional[str] = None,
+        value_shape: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a realistic memory value for the given scope.
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates realistic attention setting data. Always return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=200
-        )
+        Args:
+            scope: Memory scope (preferences, constraints, etc.)
+            domain: Optional domain (food, work, etc.)
+            value_shape: Optional specific shape to generate
+            
+        Returns:
+            Generated value_json that matches the API's expected shapes
+        """
+        value_shape = value_shape or self._pick_shape(scope)
         
-        content = response.choices[0].message.content.strip()
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        if self._cache is None:
+            return await self._generate_shape(scope, domain, value_shape)
         
-        return json.loads(content)
+        # Each read unpickles a fresh copy, so callers can't mutate the cached value
+        key = f"{self.model}|{scope}|{domain or ''}|{value_shape}"
+        value = self._cache.get(key)
+        if value is None:
+            value = await self._generate_shape(scope, domain, value_shape)
+            self._cache[key] = value
+        return value
     
-    def _generate_kv_map(self, scope: str, domain: Optional[str]) -> Dict[str, Any]:
-        """Generate key-value map using OpenAI."""
-        prompt = f"""Generate a realistic JSON object with key-value pairs for a user's {scope} preferences.
-{f'Focus on the {domain} domain.' if domain else ''}
-
-Return ONLY valid JSON object, like:
-{{
-  "key1": "value1",
-  "key2": 42,
-  "key3": true
-}}
-
-Make it realistic and specific. Include 3-6 key-value pairs. Use appropriate types (strings, numbers, booleans)."""
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates realistic preference data. Always return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
+    async def _generate_shape(self, scope: str, domain: Optional[str], value_shape: str) -> Any:
+        """Generate a value of the given shape with one completion."""
+        if value_shape not in TOKEN_BUDGETS:
+            value_shape = "kv_map"
+        return await self._call_json(
+            (SYSTEM_MESSAGE, _user_message(value_shape, scope, domain)),
             temperature=0.8,
-            max_tokens=200
+            max_tokens=TOKEN_BUDGETS[value_shape],
+            parse=PARSERS[value_shape],
+            response_format=RESPONSE_FORMATS.get(value_shape, JSON_OBJECT_FORMAT)
         )
-        
-        content = response.choices[0].message.content.strip()
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        return json.loads(content)
     
-    def generate_user_profile(self) -> Dict[str, Any]:
+    async def generate_user_profile(self) -> Dict[str, Any]:
         """Generate a realistic user profile for context."""
-        prompt = """Generate a brief, realistic user profile (2-3 sentences) describing a person's general preferences and characteristics.
-This will be used to generate consistent test data.
-
-Return ONLY plain text, no JSON, no formatting."""
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates realistic user profiles."},
-                {"role": "user", "content": prompt}
-            ],
+        profile = await self._call(
+            PROFILE_MESSAGES,
             temperature=0.9,
             max_tokens=100
         )
-        
-        return response.choices[0].message.content.strip()
+        return profile.strip()
+    
+    async def generate_user_profiles(self, count: int) -> List[str]:
+        """
+        Generate `count` distinct user profiles, up to BULK_GENERATE_SIZE per
+        completion, with the chunks requested concurrently.
+        """
+        chunks = await asyncio.gather(*(
+            self._call_json(
+                (PROFILE_MESSAGES[0], {"role": "user", "content": PROFILES_PROMPT_TEMPLATE % {"count": size}}),
+                temperature=0.9,
+                max_tokens=100 * size,
+                parse=partial(parse_profiles, count=size)
+            )
+            for size in (
+                min(BULK_GENERATE_SIZE, count - start)
+                for start in range(0, count, BULK_GENERATE_SIZE)
+            )
+        ))
+        return [profile for chunk in chunks for profile in chunk]
 
@@ -0,0 +1,38 @@
+"""
+Client-side rate limiting for outbound API calls.
+"""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio code, refilled continuously at a per-minute rate.
+    
+    Holds at most one minute's worth of tokens, so a burst after an idle
+    period can use up to a full minute's allowance and then falls back to
+    the steady rate. Create and use a bucket within a single event loop.
+    """
+    
+    def __init__(self, rate_per_minute: float):
+        """Initialize a full bucket."""
+        self.capacity = float(rate_per_minute)
+        self._rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until amount tokens are available, then take them (FIFO across waiters)."""
+        # A request larger than the bucket could never be satisfied; let it
+        # through once the bucket is full instead of waiting forever
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self._rate)
@@ -0,0 +1,51 @@
+"""
+Exact-match cache for completions, stored in SQLite.
+"""
+import hashlib
+import sqlite3
+from typing import Optional
+
+DEFAULT_PATH = ".test_llm_cache.db"
+
+
+def cache_key(*parts: str) -> str:
+    """SHA-256 over the parts, NUL-separated so ("ab", "c") and ("a", "bc") differ."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Completions keyed by a hash of everything that determines them.
+
+    Only worth using for deterministic requests (temperature 0): the key
+    should cover the model, the full prompt and any sampling parameters, so
+    a hit stands in for the exact same call. Entries persist across runs.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """Open (creating if needed) the cache database at path."""
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None."""
+        row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        """Store the response for key, replacing any previous one."""
+        self._conn.execute("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value))
+        self._conn.commit()
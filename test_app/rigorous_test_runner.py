@@ -1,16 +1,101 @@
 """
 Rigorous test runner with challenging test cases, especially for deterministic memory merging.
 """
+import asyncio
+import hashlib
 import random
+import reprlib
 import time
 import uuid
-from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime, timedelta
-import json
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Optional, Callable, Tuple, TypedDict, Union
+
+import httpx
+import orjson
 
 from test_app.api_client import MemoryAPIClient
+from test_app.async_api_client import AsyncMemoryAPIClient
 from test_app.openai_client import OpenAIDataGenerator
 
+# Memories per POST /memory/bulk request; a batch is created all-or-nothing
+STORE_BATCH_SIZE = 50
+
+# Values generated per (scope, domain) for the storage phase; memories reuse them
+VALUE_POOL_SIZE = 5
+
+# Most recent error messages kept per result category; error_count has the total
+MAX_ERRORS_KEPT = 200
+
+# Bounded repr for progress-event previews; stops formatting a value once the
+# limits are hit instead of rendering all of it and slicing
+_PREVIEW = reprlib.Repr()
+_PREVIEW.maxstring = 100
+_PREVIEW.maxother = 100
+_PREVIEW.maxdict = 10
+_PREVIEW.maxlist = 10
+
+# Consecutive failed store requests after which the storage phase gives up
+STORE_FAILURE_LIMIT = 3
+
+
+class ProgressUpdate(TypedDict):
+    """A live progress event, as passed to progress_callback."""
+    phase: str
+    test_case: str
+    status: str
+    details: Dict[str, Any]
+    timestamp: int  # Epoch milliseconds
+
+
+class RunnerAborted(Exception):
+    """A test phase gave up after repeated API failures."""
+
+
+class _FailGuard:
+    """Counts consecutive failures and aborts once there are `threshold` in a row."""
+    
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.failures = 0
+        self.last_error: Optional[Exception] = None
+    
+    def record_ok(self):
+        self.failures = 0
+    
+    def record_fail(self, error: Exception, check: bool = True):
+        self.failures += 1
+        self.last_error = error
+        if check:
+            self.check()
+    
+    def check(self):
+        """Raise RunnerAborted if the threshold has been reached."""
+        if self.failures >= self.threshold:
+            raise RunnerAborted(f"{self.failures} consecutive API failures, last: {self.last_error}")
+
+
+@dataclass(slots=True, frozen=True)
+class StoredMemory:
+    """A memory the storage phase created, as the API reported it."""
+    user_id: str
+    scope: str
+    domain: Optional[str]
+    memory_id: str
+    created_at: str
+    value_json: Union[Dict[str, Any], List[Any]]
+    value_shape: str
+
+
+def _read_fingerprint(read: Dict[str, Any]) -> bytes:
+    """Digest of a read's merged result; equal digests mean identical summaries."""
+    merged = {
+        "summary_struct": read["summary_struct"],
+        "summary_text": read["summary_text"],
+        "confidence": read["confidence"],
+    }
+    return hashlib.blake2b(orjson.dumps(merged, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
 
 class RigorousTestRunner:
     """Rigorous test runner with challenging test cases and live progress updates."""
@@ -19,34 +104,47 @@ class RigorousTestRunner:
         self, 
         api_client: MemoryAPIClient, 
         data_generator: OpenAIDataGenerator,
-        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        progress_callback: Optional[Callable[[ProgressUpdate], None]] = None
     ):
         """Initialize test runner with progress callback."""
         self.api = api_client
         self.generator = data_generator
-        self.progress_callback = progress_callback or (lambda x: None)
+        self.progress_callback = progress_callback
+        # Without a callback, skip building events nobody will see
+        self._emit_enabled = progress_callback is not None
         self.results = {
-            "store": {"success": 0, "failed": 0, "errors": [], "test_cases": []},
-            "read": {"success": 0, "failed": 0, "errors": [], "test_cases": []},
-            "merge": {"success": 0, "failed": 0, "errors": [], "test_cases": []},
-            "continue": {"success": 0, "failed": 0, "errors": [], "test_cases": []},
-            "revoke": {"success": 0, "failed": 0, "errors": [], "test_cases": []},
+            category: {
+                "success": 0,
+                "failed": 0,
+                "errors": deque(maxlen=MAX_ERRORS_KEPT),
+                "error_count": 0,
+                "test_cases": [],
+            }
+            for category in ("store", "read", "merge", "continue", "revoke")
         }
-        self.stored_memories: List[Dict[str, Any]] = []
+        self.stored_memories: List[StoredMemory] = []
         self.revocation_tokens: List[str] = []
     
+    def _add_error(self, category: str, error: str):
+        """Record an error message under a result category."""
+        self.results[category]["errors"].append(error)
+        self.results[category]["error_count"] += 1
+    
     def _emit_progress(self, phase: str, test_case: str, status: str, details: Dict[str, Any] = None):
         """Emit progress update."""
+        if not self._emit_enabled:
+            return
         self.progress_callback({
             "phase": phase,
             "test_case": test_case,
             "status": status,
             "details": details or {},
-            "timestamp": datetime.utcnow().isoformat(),
+            # Epoch milliseconds; the UI passes it straight to new Date()
+            "timestamp": time.time_ns() // 1_000_000,
         })
     
-    def run_all_tests(self, num_users: int = 3, memories_per_user: int = 10):
-        """Run comprehensive rigorous test suite."""
+    async def run_all_tests(self, num_users: int = 3, memories_per_user: int = 10):
+        """Run comprehensive rigorous test suite (drive with asyncio.run)."""
         self._emit_progress("startup", "Initializing", "info", {"users": num_users, "memories": memories_per_user})
         
         # Health check
@@ -59,99 +157,195 @@ class RigorousTestRunner:
         
         # Phase 1: Basic memory operations
         self._emit_progress("phase1", "Basic Memory Storage", "start")
-        self._test_basic_storage(num_users, memories_per_user)
+        try:
+            await self._test_basic_storage(num_users, memories_per_user)
+        except RunnerAborted as e:
+            self._emit_progress("phase1", "Phase aborted", "error", {"error": str(e)})
         
         # Phase 2: Challenging deterministic merging tests
         self._emit_progress("phase2", "Deterministic Merging Tests", "start")
         self._test_deterministic_merging()
         
-        # Phase 3: Edge cases and stress tests
+        # Phases 3-5 use their own users and don't depend on phases 1-2 or on
+        # each other, so they run concurrently
         self._emit_progress("phase3", "Edge Cases & Stress Tests", "start")
-        self._test_edge_cases()
-        
-        # Phase 4: Policy and access control
         self._emit_progress("phase4", "Policy & Access Control", "start")
-        self._test_policy_and_access()
-        
-        # Phase 5: Revocation and security
         self._emit_progress("phase5", "Revocation & Security", "start")
-        self._test_revocation()
+        async with AsyncMemoryAPIClient(self.api.base_url, self.api.api_key) as api:
+            await asyncio.gather(
+                self._test_edge_cases(api),
+                self._test_policy_and_access(api),
+                self._test_revocation(api),
+            )
         
         self._emit_progress("complete", "All Tests Complete", "success")
     
-    def _test_basic_storage(self, num_users: int, memories_per_user: int):
-        """Test basic memory storage with realistic data."""
-        domains = ["food", "work", "entertainment", "health", "travel", None]
-        sources = ["explicit_user_input", "user_setting"]
-        ttl_options = [7, 30, 90, 365]
+    async def _test_basic_storage(self, num_users: int, memories_per_user: int):
+        """
+        Test basic memory storage with realistic data.
+        
+        Every user's memories are drawn first, then values are generated once
+        into a small pool per (scope, domain) that all users draw from, rather
+        than one value per memory. Users are then stored concurrently over one
+        async API client.
+        
+        Raises:
+            RunnerAborted: STORE_FAILURE_LIMIT store requests failed in a row
+        """
+        user_specs = [self._draw_memory_specs(memories_per_user) for _ in range(num_users)]
+        pools = await self._generate_value_pools(
+            (spec["scope"], spec["domain"]) for specs in user_specs for spec in specs
+        )
+        guard = _FailGuard(STORE_FAILURE_LIMIT)
+        async with AsyncMemoryAPIClient(self.api.base_url, self.api.api_key) as api:
+            # Let every user finish or stop at the guard before re-raising
+            outcomes = await asyncio.gather(*(
+                self._store_user_memories(api, user_idx, num_users, specs, pools, guard)
+                for user_idx, specs in enumerate(user_specs)
+            ), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+    
+    @staticmethod
+    def _draw_memory_specs(count: int) -> List[Dict[str, Any]]:
+        """Draw the random scope, domain, source and TTL of `count` memories."""
+        scopes = random.choices(
+            ["preferences", "constraints", "communication", "accessibility", "schedule", "attention"],
+            k=count,
+        )
+        domains = random.choices(["food", "work", "entertainment", "health", "travel", None], k=count)
+        sources = random.choices(["explicit_user_input", "user_setting"], k=count)
+        ttls = random.choices([7, 30, 90, 365], k=count)
+        return [
+            {"scope": scope, "domain": domain, "source": source, "ttl_days": ttl_days}
+            for scope, domain, source, ttl_days in zip(scopes, domains, sources, ttls)
+        ]
+    
+    async def _generate_value_pools(
+        self,
+        pairs: Iterable[Tuple[str, Optional[str]]]
+    ) -> Dict[Tuple[str, Optional[str]], List[Any]]:
+        """
+        Generate up to VALUE_POOL_SIZE values for each (scope, domain) in pairs.
+        
+        A pair needed fewer times than that gets only as many values as it is
+        used. Each pool holds its successful values, or only the errors if
+        every generation for that pair failed.
+        """
+        sizes = Counter(pairs)
+        specs = [pair for pair, count in sizes.items() for _ in range(min(count, VALUE_POOL_SIZE))]
+        values = await self.generator.generate_many(specs, return_exceptions=True)
+        
+        pools: Dict[Tuple[str, Optional[str]], List[Any]] = {}
+        for pair, value in zip(specs, values):
+            pools.setdefault(pair, []).append(value)
+        for pair, pool in pools.items():
+            generated = [value for value in pool if not isinstance(value, Exception)]
+            pools[pair] = generated or pool
+        return pools
+    
+    async def _store_user_memories(
+        self,
+        api: AsyncMemoryAPIClient,
+        user_idx: int,
+        num_users: int,
+        specs: List[Dict[str, Any]],
+        pools: Dict[Tuple[str, Optional[str]], List[Any]],
+        guard: _FailGuard
+    ):
+        """Store one user's memories for _test_basic_storage, with values drawn from pools."""
+        user_id = f"test_user_{user_idx + 1}"
+        self._emit_progress("phase1", f"User {user_id}", "info", {"user_num": user_idx + 1, "total": num_users})
+        
+        items = []
+        for spec in specs:
+            # Shared across users; the values are only serialized, never mutated
+            value_json = random.choice(pools[(spec["scope"], spec["domain"])])
+            if isinstance(value_json, Exception):
+                self._record_store_failure(user_id, spec["scope"], value_json)
+                continue
+            items.append({**spec, "value_json": value_json})
         
-        for user_idx in range(num_users):
-            user_id = f"test_user_{user_idx + 1}"
-            self._emit_progress("phase1", f"User {user_id}", "info", {"user_num": user_idx + 1, "total": num_users})
+        # One request per batch instead of one per memory
+        for batch_start in range(0, len(items), STORE_BATCH_SIZE):
+            batch = items[batch_start:batch_start + STORE_BATCH_SIZE]
+            # Stop here if other users' requests have already tripped the guard
+            guard.check()
+            try:
+                results = (await api.store_memories_bulk(user_id, batch))["memories"]
+                guard.record_ok()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (400, 422):
+                    self._fail_store_batch(user_id, batch, e, guard)
+                    continue
+                # The server creates a batch all-or-nothing, so one invalid
+                # value rejects it; store its items one at a time so only
+                # the invalid ones fail
+                results = await asyncio.gather(
+                    *(api.store_memory(user_id, **item) for item in batch),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        guard.record_fail(result, check=False)
+                    else:
+                        guard.record_ok()
+            except Exception as e:
+                self._fail_store_batch(user_id, batch, e, guard)
+                continue
             
-            for mem_idx in range(memories_per_user):
-                scope = random.choice(["preferences", "constraints", "communication", "accessibility", "schedule", "attention"])
-                domain = random.choice(domains)
-                source = random.choice(sources)
-                ttl_days = random.choice(ttl_options)
+            for mem_idx, (item, result) in enumerate(zip(batch, results), batch_start + 1):
+                scope, domain, value_json = item["scope"], item["domain"], item["value_json"]
+                if isinstance(result, Exception):
+                    self._record_store_failure(user_id, scope, result)
+                    continue
+                memory_id = str(result["id"])
+                self.stored_memories.append(StoredMemory(
+                    user_id=user_id,
+                    scope=scope,
+                    domain=domain,
+                    memory_id=memory_id,
+                    created_at=result["created_at"],
+                    value_json=value_json,
+                    value_shape=result.get("value_shape", "unknown"),
+                ))
                 
-                try:
-                    value_json = self.generator.generate_memory_value(scope, domain)
-                    
-                    result = self.api.store_memory(
-                        user_id=user_id,
-                        scope=scope,
-                        value_json=value_json,
-                        domain=domain,
-                        source=source,
-                        ttl_days=ttl_days
-                    )
-                    
-                    memory_info = {
-                        "user_id": user_id,
-                        "scope": scope,
-                        "domain": domain,
-                        "memory_id": result["id"],
-                        "created_at": result["created_at"],
-                        "value_json": value_json,
-                        "value_shape": result.get("value_shape", "unknown"),
-                    }
-                    self.stored_memories.append(memory_info)
-                    
-                    # Emit memory stored event
-                    self._emit_progress("phase1", f"Memory stored: {scope}", "success", {
-                        "memory_id": str(result["id"]),
-                        "user_id": user_id,
-                        "scope": scope,
-                        "domain": domain,
-                        "value_preview": str(value_json)[:100] + "..." if len(str(value_json)) > 100 else str(value_json),
-                    })
-                    
-                    self.results["store"]["success"] += 1
-                    self.results["store"]["test_cases"].append({
-                        "name": f"Store {scope} memory for {user_id}",
-                        "status": "success",
-                        "memory_id": str(result["id"])
-                    })
-                    
-                    self._emit_progress("phase1", f"Stored memory {mem_idx + 1}/{memories_per_user}", "success", {
-                        "user": user_id,
-                        "scope": scope,
-                        "memory_id": str(result["id"])
-                    })
-                    
-                    time.sleep(0.05)  # Small delay
-                    
-                except Exception as e:
-                    self.results["store"]["failed"] += 1
-                    error_msg = f"{user_id} ({scope}): {str(e)}"
-                    self.results["store"]["errors"].append(error_msg)
-                    self.results["store"]["test_cases"].append({
-                        "name": f"Store {scope} memory for {user_id}",
-                        "status": "failed",
-                        "error": str(e)
-                    })
-                    self._emit_progress("phase1", f"Failed to store memory", "error", {"error": str(e)})
+                self.results["store"]["success"] += 1
+                self.results["store"]["test_cases"].append({
+                    "name": f"Store {scope} memory for {user_id}",
+                    "status": "success",
+                    "memory_id": memory_id
+                })
+                
+                # One event per stored memory, with its position and a preview
+                if not self._emit_enabled:
+                    continue
+                self._emit_progress("phase1", f"Stored memory {mem_idx}/{len(items)}: {scope}", "success", {
+                    "memory_id": memory_id,
+                    "user_id": user_id,
+                    "scope": scope,
+                    "domain": domain,
+                    "value_preview": _PREVIEW.repr(value_json),
+                })
+    
+    def _fail_store_batch(self, user_id: str, batch: List[Dict[str, Any]], error: Exception, guard: _FailGuard):
+        """Record every memory in a batch whose bulk store request failed outright."""
+        for item in batch:
+            self._record_store_failure(user_id, item["scope"], error)
+        guard.record_fail(error)
+    
+    def _record_store_failure(self, user_id: str, scope: str, error: Exception):
+        """Record a memory that could not be generated or stored."""
+        self.results["store"]["failed"] += 1
+        error_msg = f"{user_id} ({scope}): {str(error)}"
+        self._add_error("store", error_msg)
+        self.results["store"]["test_cases"].append({
+            "name": f"Store {scope} memory for {user_id}",
+            "status": "failed",
+            "error": str(error)
+        })
+        self._emit_progress("phase1", f"Failed to store memory", "error", {"error": str(error)})
     
     def _test_deterministic_merging(self):
         """Test challenging deterministic merging scenarios."""
@@ -163,29 +357,21 @@ class RigorousTestRunner:
         domain = "food"
         
         # Create memories with same second timestamp
-        base_time = datetime.utcnow()
         memories_to_create = [
             {"likes": ["pizza"], "dislikes": ["broccoli"]},
             {"likes": ["sushi"], "dislikes": ["milk"]},
             {"likes": ["pasta"], "dislikes": ["onions"]},
         ]
         
-        memory_ids = []
-        for i, value in enumerate(memories_to_create):
-            try:
-                result = self.api.store_memory(
-                    user_id=test_user,
-                    scope=scope,
-                    value_json=value,
-                    domain=domain,
-                    source="explicit_user_input",
-                    ttl_days=30
-                )
-                memory_ids.append(result["id"])
-                time.sleep(0.1)  # Ensure different timestamps
-            except Exception as e:
-                self._emit_progress("phase2", "Test: Same timestamp ordering", "error", {"error": str(e)})
-                return
+        # One bulk request, so all three share a created_at and only the ID orders them
+        try:
+            self.api.store_memories_bulk(
+                test_user,
+                [{"scope": scope, "domain": domain, "value_json": value} for value in memories_to_create]
+            )
+        except Exception as e:
+            self._emit_progress("phase2", "Test: Same timestamp ordering", "error", {"error": str(e)})
+            return
         
         # Read twice and verify identical results
         try:
@@ -195,18 +381,18 @@ class RigorousTestRunner:
                 purpose="generate personalized food recommendations",
                 domain=domain
             )
-            time.sleep(0.5)
+            # If the server's read cache is enabled it would answer read2;
+            # bypass it so two independent merges are compared
             read2 = self.api.read_memory(
                 user_id=test_user,
                 scope=scope,
                 purpose="generate personalized food recommendations",
-                domain=domain
+                domain=domain,
+                bypass_cache=True
             )
             
             # Verify deterministic results
-            if (read1["summary_struct"] == read2["summary_struct"] and 
-                read1["summary_text"] == read2["summary_text"] and
-                read1["confidence"] == read2["confidence"]):
+            if _read_fingerprint(read1) == _read_fingerprint(read2):
                 self.results["merge"]["success"] += 1
                 self.results["merge"]["test_cases"].append({
                     "name": "Deterministic merge: Same timestamp ordering",
@@ -219,7 +405,7 @@ class RigorousTestRunner:
             else:
                 self.results["merge"]["failed"] += 1
                 error = "Results were not deterministic"
-                self.results["merge"]["errors"].append(error)
+                self._add_error("merge", error)
                 self.results["merge"]["test_cases"].append({
                     "name": "Deterministic merge: Same timestamp ordering",
                     "status": "failed",
@@ -240,20 +426,13 @@ class RigorousTestRunner:
             {"likes": ["water"], "dislikes": ["soda"]},
         ]
         
-        for value in conflicting_memories:
-            try:
-                self.api.store_memory(
-                    user_id=test_user2,
-                    scope=scope,
-                    value_json=value,
-                    domain=domain,
-                    source="explicit_user_input",
-                    ttl_days=30
-                )
-                time.sleep(0.1)
-            except Exception as e:
-                self._emit_progress("phase2", "Test: Conflicting values merge", "error", {"error": str(e)})
-                break
+        try:
+            self.api.store_memories_bulk(
+                test_user2,
+                [{"scope": scope, "domain": domain, "value_json": value} for value in conflicting_memories]
+            )
+        except Exception as e:
+            self._emit_progress("phase2", "Test: Conflicting values merge", "error", {"error": str(e)})
         
         try:
             read_result = self.api.read_memory(
@@ -278,7 +457,7 @@ class RigorousTestRunner:
             else:
                 self.results["merge"]["failed"] += 1
                 error = f"Expected both coffee and tea in likes, got: {merged_likes}"
-                self.results["merge"]["errors"].append(error)
+                self._add_error("merge", error)
                 self._emit_progress("phase2", "Test: Conflicting values merge", "error", {"error": error})
         except Exception as e:
             self.results["merge"]["failed"] += 1
@@ -289,26 +468,19 @@ class RigorousTestRunner:
         test_user3 = "merge_test_user_3"
         large_memory_count = 50
         
-        for i in range(large_memory_count):
-            try:
-                value = {"likes": [f"item_{i}"], "dislikes": [f"bad_item_{i}"]}
-                self.api.store_memory(
-                    user_id=test_user3,
-                    scope=scope,
-                    value_json=value,
-                    domain=domain,
-                    source="explicit_user_input",
-                    ttl_days=30
-                )
-                if (i + 1) % 10 == 0:
-                    self._emit_progress("phase2", f"Stored {i + 1}/{large_memory_count} memories", "info", {
-                        "progress": i + 1,
-                        "total": large_memory_count
-                    })
-                time.sleep(0.05)
-            except Exception as e:
-                self._emit_progress("phase2", "Test: Large memory merge", "error", {"error": str(e)})
-                break
+        large_memories = [
+            {"scope": scope, "domain": domain, "value_json": {"likes": [f"item_{i}"], "dislikes": [f"bad_item_{i}"]}}
+            for i in range(large_memory_count)
+        ]
+        # Well under the bulk endpoint's 1000-memory limit, so one request stores them all
+        try:
+            stored = self.api.store_memories_bulk(test_user3, large_memories)["memories"]
+            self._emit_progress("phase2", f"Stored {len(stored)}/{large_memory_count} memories", "info", {
+                "progress": len(stored),
+                "total": large_memory_count
+            })
+        except Exception as e:
+            self._emit_progress("phase2", "Test: Large memory merge", "error", {"error": str(e)})
         
         try:
             read_result = self.api.read_memory(
@@ -333,7 +505,7 @@ class RigorousTestRunner:
             else:
                 self.results["merge"]["failed"] += 1
                 error = f"Expected ~{large_memory_count} likes, got {len(merged_likes)}"
-                self.results["merge"]["errors"].append(error)
+                self._add_error("merge", error)
                 self._emit_progress("phase2", "Test: Large memory merge", "error", {"error": error})
         except Exception as e:
             self.results["merge"]["failed"] += 1
@@ -344,41 +516,33 @@ class RigorousTestRunner:
         test_user4 = "merge_test_user_4"
         
         # Store some memories
-        for value in [{"likes": ["a", "b"]}, {"likes": ["c", "d"]}, {"likes": ["e"]}]:
-            try:
-                self.api.store_memory(
-                    user_id=test_user4,
-                    scope=scope,
-                    value_json=value,
-                    domain=domain,
-                    source="explicit_user_input",
-                    ttl_days=30
-                )
-                time.sleep(0.1)
-            except Exception as e:
-                break
+        try:
+            self.api.store_memories_bulk(
+                test_user4,
+                [
+                    {"scope": scope, "domain": domain, "value_json": value}
+                    for value in [{"likes": ["a", "b"]}, {"likes": ["c", "d"]}, {"likes": ["e"]}]
+                ]
+            )
+        except Exception:
+            pass
         
-        # Read 5 times and verify all are identical
+        # Read 5 times and verify all are identical, bypassing the server's
+        # read cache so each read is an independent merge
         try:
             reads = []
-            for i in range(5):
+            for _ in range(5):
                 read = self.api.read_memory(
                     user_id=test_user4,
                     scope=scope,
                     purpose="generate personalized food recommendations",
-                    domain=domain
+                    domain=domain,
+                    bypass_cache=True
                 )
                 reads.append(read)
-                time.sleep(0.2)
             
             # Verify all reads are identical
-            first_read = reads[0]
-            all_identical = all(
-                read["summary_struct"] == first_read["summary_struct"] and
-                read["summary_text"] == first_read["summary_text"] and
-                read["confidence"] == first_read["confidence"]
-                for read in reads[1:]
-            )
+            all_identical = len({_read_fingerprint(read) for read in reads}) == 1
             
             if all_identical:
                 self.results["merge"]["success"] += 1
@@ -393,19 +557,19 @@ class RigorousTestRunner:
             else:
                 self.results["merge"]["failed"] += 1
                 error = "Multiple reads returned different results"
-                self.results["merge"]["errors"].append(error)
+                self._add_error("merge", error)
                 self._emit_progress("phase2", "Test: Multiple reads determinism", "error", {"error": error})
         except Exception as e:
             self.results["merge"]["failed"] += 1
             self._emit_progress("phase2", "Test: Multiple reads determinism", "error", {"error": str(e)})
     
-    def _test_edge_cases(self):
+    async def _test_edge_cases(self, api: AsyncMemoryAPIClient):
         """Test edge cases and boundary conditions."""
         
         # Test: Empty arrays
         self._emit_progress("phase3", "Test: Empty arrays handling", "start")
         try:
-            result = self.api.store_memory(
+            result = await api.store_memory(
                 user_id="edge_test_user_1",
                 scope="preferences",
                 value_json={"likes": [], "dislikes": []},
@@ -413,7 +577,7 @@ class RigorousTestRunner:
                 source="explicit_user_input",
                 ttl_days=30
             )
-            read_result = self.api.read_memory(
+            read_result = await api.read_memory(
                 user_id="edge_test_user_1",
                 scope="preferences",
                 purpose="generate recommendations",
@@ -428,7 +592,7 @@ class RigorousTestRunner:
         # Test: Case sensitivity in normalization
         self._emit_progress("phase3", "Test: Case sensitivity normalization", "start")
         try:
-            self.api.store_memory(
+            await api.store_memory(
                 user_id="edge_test_user_2",
                 scope="preferences",
                 value_json={"likes": ["PIZZA", "pizza", "Pizza"]},
@@ -436,7 +600,7 @@ class RigorousTestRunner:
                 source="explicit_user_input",
                 ttl_days=30
             )
-            read_result = self.api.read_memory(
+            read_result = await api.read_memory(
                 user_id="edge_test_user_2",
                 scope="preferences",
                 purpose="generate recommendations",
@@ -452,7 +616,7 @@ class RigorousTestRunner:
         # Test: Different value shapes mixed
         self._emit_progress("phase3", "Test: Mixed value shapes", "start")
         try:
-            self.api.store_memory(
+            await api.store_memory(
                 user_id="edge_test_user_3",
                 scope="preferences",
                 value_json={"likes": ["item1"]},
@@ -460,7 +624,7 @@ class RigorousTestRunner:
                 source="explicit_user_input",
                 ttl_days=30
             )
-            self.api.store_memory(
+            await api.store_memory(
                 user_id="edge_test_user_3",
                 scope="preferences",
                 value_json={"theme": "dark", "language": "en"},
@@ -468,7 +632,7 @@ class RigorousTestRunner:
                 source="explicit_user_input",
                 ttl_days=30
             )
-            read_result = self.api.read_memory(
+            read_result = await api.read_memory(
                 user_id="edge_test_user_3",
                 scope="preferences",
                 purpose="generate recommendations",
@@ -480,12 +644,12 @@ class RigorousTestRunner:
             self.results["read"]["failed"] += 1
             self._emit_progress("phase3", "Test: Mixed value shapes", "error", {"error": str(e)})
     
-    def _test_policy_and_access(self):
+    async def _test_policy_and_access(self, api: AsyncMemoryAPIClient):
         """Test policy enforcement and access control."""
         # Test: Valid purpose
         self._emit_progress("phase4", "Test: Valid purpose policy", "start")
         try:
-            read_result = self.api.read_memory(
+            read_result = await api.read_memory(
                 user_id="policy_test_user",
                 scope="preferences",
                 purpose="generate personalized content",
@@ -504,7 +668,7 @@ class RigorousTestRunner:
         # Test: Invalid purpose (should be denied)
         self._emit_progress("phase4", "Test: Invalid purpose policy", "start")
         try:
-            read_result = self.api.read_memory(
+            read_result = await api.read_memory(
                 user_id="policy_test_user",
                 scope="schedule",
                 purpose="generate personalized content",  # Not allowed for schedule
@@ -525,12 +689,12 @@ class RigorousTestRunner:
                 self.results["read"]["failed"] += 1
                 self._emit_progress("phase4", "Test: Invalid purpose policy", "error", {"error": str(e)})
     
-    def _test_revocation(self):
+    async def _test_revocation(self, api: AsyncMemoryAPIClient):
         """Test revocation functionality."""
         # Create a read grant
         self._emit_progress("phase5", "Test: Revocation functionality", "start")
         try:
-            read_result = self.api.read_memory(
+            read_result = await api.read_memory(
                 user_id="revoke_test_user",
                 scope="preferences",
                 purpose="generate recommendations",
@@ -539,7 +703,7 @@ class RigorousTestRunner:
             token = read_result["revocation_token"]
             
             # Revoke it
-            revoke_result = self.api.revoke_memory(token)
+            revoke_result = await api.revoke_memory(token)
             
             if revoke_result.get("revoked"):
                 self.results["revoke"]["success"] += 1
@@ -552,7 +716,7 @@ class RigorousTestRunner:
             
             # Try to continue read (should fail)
             try:
-                self.api.continue_read_memory(token)
+                await api.continue_read_memory(token)
                 self.results["revoke"]["failed"] += 1
                 self.results["revoke"]["test_cases"].append({
                     "name": "Revoked token access denial",
@@ -562,7 +726,7 @@ class RigorousTestRunner:
                 self._emit_progress("phase5", "Test: Revoked token access", "error", {
                     "error": "Revoked token should not work"
                 })
-            except:
+            except Exception:
                 self.results["revoke"]["success"] += 1
                 self.results["revoke"]["test_cases"].append({
                     "name": "Revoked token access denial",
@@ -5,38 +5,98 @@ This tests recall, inference, synthesis, and stress tests.
 """
 import sys
 import os
+import asyncio
 import json
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from test_app.api_client import MemoryAPIClient
+from test_app.api_client import get_api_client
+from test_app.async_api_client import AsyncMemoryAPIClient
 from test_app.config import config
-from openai import OpenAI
+from test_app.openai_client import get_async_openai_client
+from test_app.response_cache import DEFAULT_PATH as RESPONSE_CACHE_PATH, ResponseCache, cache_key
+from test_app.semantic_cache import SemanticCache
+from openai import AsyncOpenAI
 
 QUESTIONS_FILE = Path(__file__).parent / "profile_test_questions.json"
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Rough token budget for the STORED MEMORIES section of the answer prompt,
+# estimated at ~4 characters per token (as in openai_client); prompt length
+# drives gpt-4o latency, so lower-confidence scopes beyond it are left out
+MEMORY_CONTEXT_BUDGET = 4000
+CHARS_PER_TOKEN = 4
+# Server-side cap on domains per POST /memory/read/merged
+MAX_READ_DOMAINS = 15
+# Questions answered at once; each holds one gpt-4o completion in flight
+MAX_CONCURRENT_QUESTIONS = 8
+# Questions whose inferred domains are kept (oldest dropped first)
+DOMAIN_CACHE_SIZE = 512
+
+_domain_cache: Dict[str, Tuple[str, ...]] = {}
 
 
 def load_questions() -> List[Dict]:
-    """Load test questions from JSON file."""
-    with open(QUESTIONS_FILE) as f:
-        data = json.load(f)
-    return data["questions"]
+    """
+    Load test questions from JSON file.
+    
+    Each question gets its lowercased keywords (_expected_lc) computed once
+    up front, for evaluate_answer.
+    """
+    questions = orjson.loads(QUESTIONS_FILE.read_bytes())["questions"]
+    for question_data in questions:
+        _prepare_keywords(question_data)
+    return questions
 
 
-def ask_question(question: str, user_id: str, api_client: MemoryAPIClient, openai_client: OpenAI) -> str:
-    """Ask a question and get the AI's response using stored memories."""
-    # First, retrieve relevant memories
-    # We'll query all scopes to get comprehensive context
-    scopes = ['preferences', 'constraints', 'communication', 'accessibility', 'schedule', 'attention']
-    all_memories = []
+def _prepare_keywords(question_data: Dict) -> None:
+    """Attach _expected_lc to a question."""
+    question_data["_expected_lc"] = [k.lower() for k in question_data.get("expected_keywords", [])]
+
+
+async def infer_domains(
+    question: str,
+    openai_client: AsyncOpenAI,
+    response_cache: Optional[ResponseCache] = None,
+) -> Tuple[str, ...]:
+    """
+    Ask the model which memory domains a question touches (cached per question).
     
-    for scope in scopes:
-        try:
-            # Try to infer relevant domains from the question
-            domain_prompt = f"""Analyze this question and determine which memory domains might be relevant: "{question}"
+    With a response_cache, the model's reply is also stored on disk, so
+    later runs skip the call for questions seen before.
+    """
+    cached = _domain_cache.get(question)
+    if cached is not None:
+        return cached
+    
+    key = cache_key(question, "gpt-4o-mini-domains")
+    domains_text = response_cache.get(key) if response_cache is not None else None
+    if domains_text is None:
+        domains_text = await _ask_domains(question, openai_client)
+        if response_cache is not None:
+            response_cache.put(key, domains_text)
+    
+    try:
+        domains = json.loads(domains_text)
+        if not isinstance(domains, list):
+            domains = []
+    except:
+        domains = []
+    
+    if len(_domain_cache) >= DOMAIN_CACHE_SIZE:
+        del _domain_cache[next(iter(_domain_cache))]
+    _domain_cache[question] = tuple(domains)
+    return _domain_cache[question]
+
+
+async def _ask_domains(question: str, openai_client: AsyncOpenAI) -> str:
+    """One domain-inference completion; returns the reply text."""
+    domain_prompt = f"""Analyze this question and determine which memory domains might be relevant: "{question}"
 
 Common domains: food, work, personal, health, entertainment, family, travel, pets, hobbies, education, finance, shopping, social, relationships, lifestyle, finance, etc.
 
@@ -44,79 +104,83 @@ Return a JSON array of relevant domain names, or empty array if none are specifi
 
 Return ONLY a JSON array:"""
 
-            domain_response = openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You analyze questions to determine relevant memory domains. Return only JSON arrays."},
-                    {"role": "user", "content": domain_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=50
-            )
-            
-            domains_text = domain_response.choices[0].message.content.strip()
-            try:
-                domains = json.loads(domains_text)
-                if not isinstance(domains, list):
-                    domains = []
-            except:
-                domains = []
-            
-            # Query without domain first
-            try:
-                response = api_client.read_memory(
-                    user_id=user_id,
-                    scope=scope,
-                    purpose="generate personalized content",
-                    max_age_days=365
-                )
-                if response.get("summary_struct") and response["summary_struct"]:
-                    all_memories.append({
-                        "scope": scope,
-                        "data": response["summary_struct"],
-                        "confidence": response.get("confidence", 1.0)
-                    })
-            except:
-                pass
-            
-            # Query with inferred domains
-            for domain in domains:
-                try:
-                    response = api_client.read_memory(
-                        user_id=user_id,
-                        scope=scope,
-                        domain=domain,
-                        purpose="generate personalized content",
-                        max_age_days=365
-                    )
-                    if response.get("summary_struct") and response["summary_struct"]:
-                        # Merge with existing scope data
-                        existing = next((m for m in all_memories if m["scope"] == scope), None)
-                        if existing:
-                            # Merge the data
-                            existing_data = existing["data"]
-                            new_data = response["summary_struct"]
-                            if isinstance(existing_data, dict) and isinstance(new_data, dict):
-                                # Simple merge
-                                for k, v in new_data.items():
-                                    if k in existing_data:
-                                        if isinstance(existing_data[k], list) and isinstance(v, list):
-                                            existing_data[k] = list(set(existing_data[k] + v))
-                                        elif isinstance(existing_data[k], dict) and isinstance(v, dict):
-                                            existing_data[k].update(v)
-                                    else:
-                                        existing_data[k] = v
-                        else:
-                            all_memories.append({
-                                "scope": scope,
-                                "data": response["summary_struct"],
-                                "confidence": response.get("confidence", 1.0)
-                            })
-                except:
-                    pass
-        except Exception as e:
-            print(f"  Warning: Error retrieving {scope} memories: {e}")
-            continue
+    domain_response = await openai_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You analyze questions to determine relevant memory domains. Return only JSON arrays."},
+            {"role": "user", "content": domain_prompt}
+        ],
+        temperature=0.3,
+        max_tokens=50
+    )
+    
+    return domain_response.choices[0].message.content.strip()
+
+
+async def embed_question(question: str, openai_client: AsyncOpenAI) -> List[float]:
+    """Embed a question for semantic cache lookups."""
+    response = await openai_client.embeddings.create(model=EMBEDDING_MODEL, input=question)
+    return response.data[0].embedding
+
+
+async def ask_question(
+    question: str,
+    user_id: str,
+    api_client: AsyncMemoryAPIClient,
+    openai_client: AsyncOpenAI,
+    answer_cache: Optional[SemanticCache] = None,
+    response_cache: Optional[ResponseCache] = None,
+) -> str:
+    """
+    Ask a question and get the AI's response using stored memories.
+    
+    With an answer_cache, a question close enough to one already answered
+    for this user, against the same memories, returns the cached answer
+    without calling the model.
+    
+    With a response_cache, the answer is generated at temperature 0 and
+    stored under a hash of the user, question and full prompt, so a repeat
+    run with unchanged memories skips the completion; inferred domains are
+    cached there too.
+    """
+    # First, retrieve relevant memories
+    # We'll query all scopes to get comprehensive context
+    scopes = ['preferences', 'constraints', 'communication', 'accessibility', 'schedule', 'attention']
+    
+    # The relevant domains depend only on the question, so infer them once for all scopes
+    try:
+        domains = await infer_domains(question, openai_client, response_cache)
+    except Exception as e:
+        print(f"  Warning: Error inferring memory domains: {e}")
+        domains = ()
+    
+    # One request reads every scope unfiltered and within each domain, and
+    # the server merges each scope's summaries (unfiltered read first)
+    domains = [d for d in dict.fromkeys(domains) if isinstance(d, str)][:MAX_READ_DOMAINS]
+    try:
+        merged = await api_client.read_memory_merged(
+            user_id=user_id,
+            scopes=scopes,
+            domains=domains,
+            purpose="generate personalized content",
+            max_age_days=365
+        )
+    except Exception as e:
+        print(f"  Warning: Error retrieving memories: {e}")
+        merged = {"scopes": {}}
+    all_memories = {
+        scope: {"data": entry["summary_struct"], "confidence": entry["confidence"]}
+        for scope, entry in merged["scopes"].items()
+        if entry["summary_struct"]
+    }
+    
+    # Cached answers only stand while the memories they were based on are unchanged
+    if answer_cache is not None:
+        fingerprint = cache_key(orjson.dumps(all_memories, option=orjson.OPT_SORT_KEYS).decode())
+        embedding = await embed_question(question, openai_client)
+        cached = answer_cache.get(user_id, embedding, fingerprint)
+        if cached is not None:
+            return cached
     
     # Build context with memories
     context = f"""You are a helpful AI assistant with access to the user's stored memories.
@@ -124,10 +188,22 @@ Return ONLY a JSON array:"""
 STORED MEMORIES:
 """
     if all_memories:
-        for mem in all_memories:
-            context += f"\n{mem['scope'].upper()} (confidence: {mem['confidence']:.2f}):\n"
-            context += json.dumps(mem['data'], indent=2)
-            context += "\n"
+        # Most confident scopes first, compact JSON, until the budget is spent
+        budget = MEMORY_CONTEXT_BUDGET * CHARS_PER_TOKEN
+        omitted = []
+        for scope, mem in sorted(all_memories.items(), key=lambda item: -item[1]["confidence"]):
+            section = (
+                f"\n{scope.upper()} (confidence: {mem['confidence']:.2f}):\n"
+                + json.dumps(mem['data'], separators=(",", ":"))
+                + "\n"
+            )
+            if len(section) > budget:
+                omitted.append(scope)
+                continue
+            context += section
+            budget -= len(section)
+        if omitted:
+            context += f"\n(Omitted for length: {', '.join(omitted)})\n"
     else:
         context += "No memories stored yet.\n"
     
@@ -143,29 +219,47 @@ User question: {question}
 
 Answer the question based on the stored memories above. Be specific and detailed."""
 
-    # Get AI response
-    response = openai_client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": context}
-        ],
-        temperature=0.7,
-        max_tokens=500
-    )
+    # Pin sampling when caching, so a cached answer is the one a call would give
+    temperature = 0.0 if response_cache is not None else 0.7
+    answer = None
+    if response_cache is not None:
+        key = cache_key(user_id, question, "gpt-4o", str(temperature), context)
+        answer = response_cache.get(key)
+    if answer is None:
+        # Get AI response
+        response = await openai_client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": context}
+            ],
+            temperature=temperature,
+            max_tokens=500
+        )
+        answer = response.choices[0].message.content
+        if response_cache is not None:
+            response_cache.put(key, answer)
     
-    return response.choices[0].message.content
+    if answer_cache is not None:
+        answer_cache.put(user_id, embedding, answer, fingerprint)
+    return answer
 
 
 def evaluate_answer(question_data: Dict, answer: str) -> Tuple[bool, str]:
-    """Evaluate if the answer contains expected keywords and is appropriate."""
+    """
+    Evaluate if the answer contains expected keywords and is appropriate.
+    
+    Uses the lowercased keywords load_questions attached to question_data,
+    computing them first for a question that didn't come from there.
+    """
+    if "_expected_lc" not in question_data:
+        _prepare_keywords(question_data)
     expected_keywords = question_data.get("expected_keywords", [])
     answer_lower = answer.lower()
     
     found_keywords = []
     missing_keywords = []
-    
-    for keyword in expected_keywords:
-        if keyword.lower() in answer_lower:
+    for keyword, keyword_lc in zip(expected_keywords, question_data["_expected_lc"]):
+        if keyword_lc in answer_lower:
             found_keywords.append(keyword)
         else:
             missing_keywords.append(keyword)
@@ -181,20 +275,55 @@ def evaluate_answer(question_data: Dict, answer: str) -> Tuple[bool, str]:
     return passed, evaluation
 
 
-def run_tests(user_id: str = "profile_test_user", limit: int = None):
-    """Run all test questions."""
+async def answer_questions(
+    questions: List[Dict],
+    user_id: str,
+    answer_cache: Optional[SemanticCache] = None,
+    response_cache: Optional[ResponseCache] = None,
+) -> List:
+    """
+    Answer the questions concurrently, at most MAX_CONCURRENT_QUESTIONS at a time.
+    
+    Returns:
+        Answers (or the exception that question raised), in question order
+    """
+    api = get_api_client()
+    openai_client = get_async_openai_client()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUESTIONS)
+    
+    async def answer(question_data: Dict) -> str:
+        async with semaphore:
+            return await ask_question(
+                question_data["question"], user_id, api_client, openai_client, answer_cache, response_cache
+            )
+    
+    async with AsyncMemoryAPIClient(api.base_url, api.api_key) as api_client:
+        return await asyncio.gather(*(answer(q) for q in questions), return_exceptions=True)
+
+
+def run_tests(
+    user_id: str = "profile_test_user",
+    limit: int = None,
+    answer_cache_path: Optional[str] = None,
+    response_cache_path: Optional[str] = None,
+):
+    """
+    Run all test questions.
+    
+    With an answer cache path (config.answer_cache_path by default), answers
+    are stored on disk and reused for the same or paraphrased questions while
+    the user's memories are unchanged, including across runs. With a response cache path, answers are generated
+    deterministically and reused verbatim while the prompt is unchanged.
+    """
     print("=" * 80)
     print("Profile Memory System Test Suite")
     print("=" * 80)
     print(f"User ID: {user_id}")
     print()
     
-    # Initialize clients
-    api_client = MemoryAPIClient(
-        base_url=config.api_base_url,
-        api_key=config.api_key
-    )
-    openai_client = OpenAI(api_key=config.openai_api_key)
+    answer_cache_path = answer_cache_path or config.answer_cache_path
+    answer_cache = SemanticCache(answer_cache_path) if answer_cache_path else None
+    response_cache = ResponseCache(response_cache_path) if response_cache_path else None
     
     # Load questions
     questions = load_questions()
@@ -204,14 +333,18 @@ def run_tests(user_id: str = "profile_test_user", limit: int = None):
     print(f"Running {len(questions)} test questions...")
     print()
     
+    # Answers are independent, so fetch them all concurrently, then report
+    # and evaluate them in order
+    answers = asyncio.run(answer_questions(questions, user_id, answer_cache, response_cache))
+    
     results = {
         "total": len(questions),
         "passed": 0,
         "failed": 0,
-        "by_category": {}
+        "by_category": defaultdict(Counter)
     }
     
-    for i, question_data in enumerate(questions, 1):
+    for i, (question_data, answer) in enumerate(zip(questions, answers), 1):
         category = question_data["category"]
         question = question_data["question"]
         q_id = question_data["id"]
@@ -220,31 +353,29 @@ def run_tests(user_id: str = "profile_test_user", limit: int = None):
         print("-" * 80)
         
         try:
-            answer = ask_question(question, user_id, api_client, openai_client)
+            if isinstance(answer, BaseException):
+                raise answer
             print(f"Answer: {answer[:200]}...")
             print()
             
             passed, evaluation = evaluate_answer(question_data, answer)
             print(f"Evaluation: {'✓ PASS' if passed else '✗ FAIL'} - {evaluation}")
             
-            if passed:
-                results["passed"] += 1
-            else:
-                results["failed"] += 1
+            outcome = "passed" if passed else "failed"
+            results[outcome] += 1
+            results["by_category"][category][outcome] += 1
             
-            if category not in results["by_category"]:
-                results["by_category"][category] = {"passed": 0, "failed": 0}
-            if passed:
-                results["by_category"][category]["passed"] += 1
-            else:
-                results["by_category"][category]["failed"] += 1
-                
         except Exception as e:
             print(f"✗ ERROR: {e}")
             results["failed"] += 1
         
         print()
     
+    if answer_cache is not None:
+        answer_cache.close()
+    if response_cache is not None:
+        response_cache.close()
+    
     # Print summary
     print("=" * 80)
     print("SUMMARY")
@@ -265,7 +396,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run profile memory system tests")
     parser.add_argument("--user-id", default="profile_test_user", help="User ID to test (default: profile_test_user)")
     parser.add_argument("--limit", type=int, help="Limit number of questions to run")
+    parser.add_argument("--answer-cache", help="Reuse answers for the same or paraphrased questions from this cache file")
+    parser.add_argument("--cache", nargs="?", const=RESPONSE_CACHE_PATH, metavar="PATH",
+                        help=f"Answer at temperature 0 and reuse identical completions from a SQLite cache (default: {RESPONSE_CACHE_PATH})")
     args = parser.parse_args()
     
-    run_tests(args.user_id, args.limit)
+    run_tests(args.user_id, args.limit, args.answer_cache, args.cache)
 
@@ -0,0 +1,75 @@
+"""
+Semantic cache for answers to questions about a user's memories.
+"""
+import math
+import shelve
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Cosine similarity at or above which two questions count as the same;
+# high enough that only paraphrases match, not related questions
+DEFAULT_THRESHOLD = 0.92
+
+_Entry = Tuple[Tuple[float, ...], str]
+
+
+def _key(user_id: str, fingerprint: str) -> str:
+    """Entries key for a user's memories in a given state."""
+    return f"{user_id}\0{fingerprint}"
+
+
+def _normalize(embedding: Sequence[float]) -> Tuple[float, ...]:
+    """Scale an embedding to unit length, so a dot product is its cosine similarity."""
+    norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+    return tuple(x / norm for x in embedding)
+
+
+class SemanticCache:
+    """
+    Answers keyed by (user_id, memory fingerprint, question embedding).
+
+    get() returns the answer stored for the most similar question embedding
+    of the same user and fingerprint, if it clears the threshold, so
+    paraphrases of a question already answered hit the cache. The
+    fingerprint identifies the memories the answer was based on; once they
+    change, the old answers no longer match. Entries are scanned linearly,
+    which is plenty for a test suite's few hundred questions.
+
+    With a path, entries are stored on disk (shelve, one key per user) and
+    reused across runs; without one the cache lives only in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD):
+        """Initialize the cache, loading any entries already stored at path."""
+        self.threshold = threshold
+        self._shelf = shelve.open(path) if path else None
+        self._entries: Dict[str, List[_Entry]] = dict(self._shelf) if self._shelf is not None else {}
+
+    def __enter__(self) -> "SemanticCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the on-disk store, if any."""
+        if self._shelf is not None:
+            self._shelf.close()
+            self._shelf = None
+
+    def get(self, user_id: str, embedding: Sequence[float], fingerprint: str = "") -> Optional[str]:
+        """Return the answer for the closest cached question, or None if none is close enough."""
+        query = _normalize(embedding)
+        best_answer, best_score = None, self.threshold
+        for cached, answer in self._entries.get(_key(user_id, fingerprint), ()):
+            score = sum(a * b for a, b in zip(query, cached))
+            if score >= best_score:
+                best_answer, best_score = answer, score
+        return best_answer
+
+    def put(self, user_id: str, embedding: Sequence[float], answer: str, fingerprint: str = "") -> None:
+        """Store the answer to a question with this embedding."""
+        key = _key(user_id, fingerprint)
+        entries = self._entries.setdefault(key, [])
+        entries.append((_normalize(embedding), answer))
+        if self._shelf is not None:
+            self._shelf[key] = entries
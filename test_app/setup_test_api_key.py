@@ -15,7 +15,17 @@ from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import App
 from app.utils import hash_api_key
-from app.config import settings
+
+# bcrypt's minimum cost. The key is internal and only stored in a 0600 file
+# beside this script, so the default cost (settings.api_key_salt_rounds) buys
+# nothing here; the hash stays bcrypt, so verification is unchanged.
+TEST_KEY_SALT_ROUNDS = 4
+
+
+def _mint_key() -> tuple[str, str]:
+    """Generate a new test API key and return (api_key, api_key_hash)."""
+    api_key = f"sk_test_{os.urandom(16).hex()}"
+    return api_key, hash_api_key(api_key, TEST_KEY_SALT_ROUNDS)
 
 
 def get_or_create_test_app() -> tuple[str, str]:
@@ -32,9 +42,7 @@ def get_or_create_test_app() -> tuple[str, str]:
             # App exists, but we need the original API key
             # Since we hash keys, we can't retrieve the original
             # So we'll create a new one and update the hash
-            import uuid
-            api_key = f"sk_test_{uuid.uuid4().hex}"
-            api_key_hash = hash_api_key(api_key, settings.api_key_salt_rounds)
+            api_key, api_key_hash = _mint_key()
             
             # Update the existing app with new key hash
             test_app.api_key_hash = api_key_hash
@@ -43,9 +51,7 @@ def get_or_create_test_app() -> tuple[str, str]:
             return str(test_app.id), api_key
         else:
             # Create new test app
-            import uuid
-            api_key = f"sk_test_{uuid.uuid4().hex}"
-            api_key_hash = hash_api_key(api_key, settings.api_key_salt_rounds)
+            api_key, api_key_hash = _mint_key()
             
             app = App(
                 name="Test App (Internal)",
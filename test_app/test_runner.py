@@ -1,15 +1,19 @@
 """
 Test runner for comprehensive API testing.
 """
+import asyncio
 import random
-import time
-from typing import Dict, Any, List, Optional
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-import json
+
+import orjson
 
 from test_app.api_client import MemoryAPIClient
+from test_app.async_api_client import AsyncMemoryAPIClient
 from test_app.openai_client import OpenAIDataGenerator
 from test_app.config import config
+from test_app.rate_limiter import AsyncTokenBucket
 
 
 class TestRunner:
@@ -27,9 +31,13 @@ class TestRunner:
         }
         self.stored_memories: List[Dict[str, Any]] = []
         self.revocation_tokens: List[str] = []
+        self.user_profiles: Dict[str, str] = {}
+        # Paces every Memory API call after the health check, in place of a
+        # fixed sleep after each one
+        self._api_bucket = AsyncTokenBucket(config.api_requests_per_minute)
     
-    def run_all_tests(self, num_users: int = 5, memories_per_user: int = 20):
-        """Run comprehensive test suite."""
+    async def run_all_tests(self, num_users: int = 5, memories_per_user: int = 20):
+        """Run comprehensive test suite (drive with asyncio.run)."""
         print("=" * 80)
         print("Starting Comprehensive API Test Suite")
         print("=" * 80)
@@ -46,107 +54,176 @@ class TestRunner:
         
         print()
         
-        # Generate test data and store memories
-        print("Phase 1: Generating and Storing Memories")
-        print("-" * 80)
-        self._generate_and_store_memories(num_users, memories_per_user)
-        print()
+        async with AsyncMemoryAPIClient(self.api.base_url, self.api.api_key) as api:
+            # Generate test data and store memories
+            print("Phase 1: Generating and Storing Memories")
+            print("-" * 80)
+            await self._generate_and_store_memories(api, num_users, memories_per_user)
+            print()
+            
+            # Test reading memories
+            print("Phase 2: Reading Memories")
+            print("-" * 80)
+            await self._test_read_memories(api)
+            print()
+            
+            # Test continue reading
+            print("Phase 3: Continue Reading with Revocation Tokens")
+            print("-" * 80)
+            await self._test_continue_read(api)
+            print()
+            
+            # Test revoking access
+            print("Phase 4: Revoking Memory Access")
+            print("-" * 80)
+            await self._test_revoke(api)
+            print()
+            
+            # Test that revoked tokens don't work
+            print("Phase 5: Verifying Revocation")
+            print("-" * 80)
+            await self._test_revoked_tokens(api)
+            print()
         
-        # Test reading memories
-        print("Phase 2: Reading Memories")
-        print("-" * 80)
-        self._test_read_memories()
-        print()
+        # Print summary
+        self._print_summary()
+    
+    async def _generate_and_store_memories(
+        self,
+        api: AsyncMemoryAPIClient,
+        num_users: int,
+        memories_per_user: int
+    ):
+        """
+        Generate realistic memories and store them.
         
-        # Test continue reading
-        print("Phase 3: Continue Reading with Revocation Tokens")
-        print("-" * 80)
-        self._test_continue_read()
-        print()
+        Users are generated concurrently, and each user's memories are stored
+        as soon as that user's values are ready, so storing overlaps with
+        generation for the remaining users. All user profiles are generated
+        together alongside.
+        """
+        user_ids = [f"test_user_{user_idx + 1}" for user_idx in range(num_users)]
+        profiles_task = asyncio.create_task(self._generate_user_profiles(user_ids))
+        tasks = [
+            asyncio.create_task(self._generate_user_values(user_id, memories_per_user))
+            for user_id in user_ids
+        ]
+        store_semaphore = asyncio.Semaphore(config.max_concurrent_stores)
+        for future in asyncio.as_completed(tasks):
+            user_id, specs, values = await future
+            await self._store_user_memories(api, user_id, specs, values, store_semaphore)
+        await profiles_task
         
-        # Test revoking access
-        print("Phase 4: Revoking Memory Access")
-        print("-" * 80)
-        self._test_revoke()
-        print()
+        print(f"\n✓ Stored {self.results['store']['success']} memories successfully")
+        if self.results["store"]["failed"] > 0:
+            print(f"✗ Failed to store {self.results['store']['failed']} memories")
+    
+    async def _generate_user_profiles(self, user_ids: List[str]):
+        """
+        Generate a profile for each user with one batched request.
         
-        # Test that revoked tokens don't work
-        print("Phase 5: Verifying Revocation")
-        print("-" * 80)
-        self._test_revoked_tokens()
-        print()
+        With config.profile_cache_path set, profiles are kept in that JSON
+        file by user_id; only users without one are generated, and the new
+        profiles are written back for the next run.
+        """
+        cache_path = Path(config.profile_cache_path) if config.profile_cache_path else None
+        cache: Dict[str, str] = {}
+        if cache_path is not None and cache_path.exists():
+            cache = orjson.loads(cache_path.read_bytes())
         
-        # Print summary
-        self._print_summary()
+        for user_id in user_ids:
+            if user_id in cache:
+                self.user_profiles[user_id] = cache[user_id]
+                print(f"Loaded cached profile for {user_id}: {cache[user_id][:60]}...")
+        
+        missing = [user_id for user_id in user_ids if user_id not in cache]
+        if not missing:
+            return
+        
+        try:
+            profiles = await self.generator.generate_user_profiles(len(missing))
+        except Exception as e:
+            print(f"Warning: Could not generate user profiles: {e}")
+            profiles = None
+        
+        for user_id, profile in zip(missing, profiles or ["Generic user"] * len(missing)):
+            self.user_profiles[user_id] = profile
+            print(f"Generated profile for {user_id}: {profile[:60]}...")
+        
+        # Don't persist the placeholder used when generation failed
+        if cache_path is not None and profiles is not None:
+            cache.update(zip(missing, profiles))
+            cache_path.write_bytes(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
     
-    def _generate_and_store_memories(self, num_users: int, memories_per_user: int):
-        """Generate realistic memories and store them."""
+    async def _generate_user_values(self, user_id: str, memories_per_user: int) -> Tuple[str, List[Tuple[str, Optional[str]]], List[Any]]:
+        """Generate all of a user's memory values; returns (user_id, specs, values)."""
         domains = ["food", "work", "entertainment", "health", "travel", None]
+        
+        # Generate all of this user's memory values in one concurrent batch
+        specs = [
+            (random.choice(config.test_scopes), random.choice(domains))
+            for _ in range(memories_per_user)
+        ]
+        values = await self.generator.generate_many(specs, return_exceptions=True)
+        return user_id, specs, values
+    
+    async def _store_user_memories(
+        self,
+        api: AsyncMemoryAPIClient,
+        user_id: str,
+        specs: List[Tuple[str, Optional[str]]],
+        values: List[Any],
+        store_semaphore: asyncio.Semaphore
+    ):
+        """Store one user's generated memories, up to max_concurrent_stores at a time."""
         sources = ["explicit_user_input", "user_setting"]
         ttl_options = [7, 30, 90, 365]
+        stored = 0
         
-        user_profiles = {}
-        for user_idx in range(num_users):
-            user_id = f"test_user_{user_idx + 1}"
-            
-            # Generate a user profile for consistency
+        async def store(scope, domain, value_json):
+            nonlocal stored
             try:
-                profile = self.generator.generate_user_profile()
-                user_profiles[user_id] = profile
-                print(f"Generated profile for {user_id}: {profile[:60]}...")
-            except Exception as e:
-                print(f"Warning: Could not generate profile for {user_id}: {e}")
-                user_profiles[user_id] = "Generic user"
-            
-            # Generate memories for this user
-            for mem_idx in range(memories_per_user):
-                scope = random.choice(config.test_scopes)
-                domain = random.choice(domains)
-                source = random.choice(sources)
-                ttl_days = random.choice(ttl_options)
+                if isinstance(value_json, Exception):
+                    raise value_json
                 
-                try:
-                    # Generate realistic value
-                    value_json = self.generator.generate_memory_value(scope, domain)
-                    
-                    # Store memory
-                    result = self.api.store_memory(
+                async with store_semaphore:
+                    await self._api_bucket.acquire()
+                    result = await api.store_memory(
                         user_id=user_id,
                         scope=scope,
                         value_json=value_json,
                         domain=domain,
-                        source=source,
-                        ttl_days=ttl_days
+                        source=random.choice(sources),
+                        ttl_days=random.choice(ttl_options)
                     )
-                    
-                    self.stored_memories.append({
-                        "user_id": user_id,
-                        "scope": scope,
-                        "domain": domain,
-                        "memory_id": result["id"],
-                        "created_at": result["created_at"]
-                    })
-                    
-                    self.results["store"]["success"] += 1
-                    
-                    if (mem_idx + 1) % 5 == 0:
-                        print(f"  {user_id}: Stored {mem_idx + 1}/{memories_per_user} memories...")
-                    
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    self.results["store"]["failed"] += 1
-                    error_msg = f"{user_id} ({scope}): {str(e)}"
-                    self.results["store"]["errors"].append(error_msg)
-                    print(f"  ✗ Failed to store memory: {error_msg}")
+                
+                self.stored_memories.append({
+                    "user_id": user_id,
+                    "scope": scope,
+                    "domain": domain,
+                    "memory_id": result["id"],
+                    "created_at": result["created_at"]
+                })
+                
+                self.results["store"]["success"] += 1
+                stored += 1
+                
+                if stored % 5 == 0:
+                    print(f"  {user_id}: Stored {stored}/{len(specs)} memories...")
+                
+            except Exception as e:
+                self.results["store"]["failed"] += 1
+                error_msg = f"{user_id} ({scope}): {str(e)}"
+                self.results["store"]["errors"].append(error_msg)
+                print(f"  ✗ Failed to store memory: {error_msg}")
         
-        print(f"\n✓ Stored {self.results['store']['success']} memories successfully")
-        if self.results["store"]["failed"] > 0:
-            print(f"✗ Failed to store {self.results['store']['failed']} memories")
+        await asyncio.gather(*(
+            store(scope, domain, value_json)
+            for (scope, domain), value_json in zip(specs, values)
+        ))
     
-    def _test_read_memories(self):
-        """Test reading memories with various purposes."""
+    async def _test_read_memories(self, api: AsyncMemoryAPIClient):
+        """Test reading memories with various purposes, issuing the reads concurrently."""
         # Group memories by user and scope
         user_scopes = {}
         for mem in self.stored_memories:
@@ -166,15 +243,15 @@ class TestRunner:
         }
         
         tested = 0
-        for (user_id, scope, domain), memories in list(user_scopes.items())[:20]:  # Limit to 20 tests
-            if not memories:
-                continue
-            
+        
+        async def read(user_id, scope, domain):
+            nonlocal tested
             purposes = purpose_map.get(scope, ["generate content"])
             purpose = random.choice(purposes)
             
             try:
-                result = self.api.read_memory(
+                await self._api_bucket.acquire()
+                result = await api.read_memory(
                     user_id=user_id,
                     scope=scope,
                     purpose=purpose,
@@ -196,20 +273,24 @@ class TestRunner:
                 if tested % 5 == 0:
                     print(f"  Read {tested} memory sets...")
                 
-                time.sleep(0.1)
-                
             except Exception as e:
                 self.results["read"]["failed"] += 1
                 error_msg = f"{user_id} ({scope}): {str(e)}"
                 self.results["read"]["errors"].append(error_msg)
                 print(f"  ✗ Failed to read: {error_msg}")
         
+        await asyncio.gather(*(
+            read(user_id, scope, domain)
+            for (user_id, scope, domain), memories in list(user_scopes.items())[:20]  # Limit to 20 tests
+            if memories
+        ))
+        
         print(f"\n✓ Read {self.results['read']['success']} memory sets successfully")
         if self.results["read"]["failed"] > 0:
             print(f"✗ Failed to read {self.results['read']['failed']} memory sets")
     
-    def _test_continue_read(self):
-        """Test continuing to read with revocation tokens."""
+    async def _test_continue_read(self, api: AsyncMemoryAPIClient):
+        """Test continuing to read with revocation tokens, concurrently."""
         if not self.revocation_tokens:
             print("  No revocation tokens available for continue read test")
             return
@@ -217,14 +298,14 @@ class TestRunner:
         # Test continuing with a subset of tokens
         tokens_to_test = self.revocation_tokens[:min(10, len(self.revocation_tokens))]
         
-        for token_info in tokens_to_test:
+        async def continue_read(token_info):
             try:
-                result = self.api.continue_read_memory(
+                await self._api_bucket.acquire()
+                await api.continue_read_memory(
                     revocation_token=token_info["token"]
                 )
                 
                 self.results["continue"]["success"] += 1
-                time.sleep(0.1)
                 
             except Exception as e:
                 self.results["continue"]["failed"] += 1
@@ -232,12 +313,14 @@ class TestRunner:
                 self.results["continue"]["errors"].append(error_msg)
                 print(f"  ✗ Failed to continue read: {error_msg}")
         
+        await asyncio.gather(*(continue_read(token_info) for token_info in tokens_to_test))
+        
         print(f"✓ Continued reading {self.results['continue']['success']} times successfully")
         if self.results["continue"]["failed"] > 0:
             print(f"✗ Failed to continue read {self.results['continue']['failed']} times")
     
-    def _test_revoke(self):
-        """Test revoking memory access."""
+    async def _test_revoke(self, api: AsyncMemoryAPIClient):
+        """Test revoking memory access, concurrently."""
         if not self.revocation_tokens:
             print("  No revocation tokens available for revoke test")
             return
@@ -245,9 +328,10 @@ class TestRunner:
         # Revoke a subset of tokens
         tokens_to_revoke = self.revocation_tokens[:min(5, len(self.revocation_tokens))]
         
-        for token_info in tokens_to_revoke:
+        async def revoke(token_info):
             try:
-                result = self.api.revoke_memory(
+                await self._api_bucket.acquire()
+                result = await api.revoke_memory(
                     revocation_token=token_info["token"]
                 )
                 
@@ -257,27 +341,28 @@ class TestRunner:
                     self.results["revoke"]["failed"] += 1
                     self.results["revoke"]["errors"].append(f"Revoke returned revoked=False")
                 
-                time.sleep(0.1)
-                
             except Exception as e:
                 self.results["revoke"]["failed"] += 1
                 error_msg = f"Token {token_info['token'][:8]}...: {str(e)}"
                 self.results["revoke"]["errors"].append(error_msg)
                 print(f"  ✗ Failed to revoke: {error_msg}")
         
+        await asyncio.gather(*(revoke(token_info) for token_info in tokens_to_revoke))
+        
         print(f"✓ Revoked {self.results['revoke']['success']} tokens successfully")
         if self.results["revoke"]["failed"] > 0:
             print(f"✗ Failed to revoke {self.results['revoke']['failed']} tokens")
     
-    def _test_revoked_tokens(self):
+    async def _test_revoked_tokens(self, api: AsyncMemoryAPIClient):
         """Test that revoked tokens no longer work."""
         # Try to continue reading with revoked tokens
         revoked_count = 0
-        for token_info in self.revocation_tokens[:5]:  # Only test first 5
+        
+        async def check(token_info):
+            nonlocal revoked_count
             try:
-                result = self.api.continue_read_memory(
-                    revocation_token=token_info["token"]
-                )
+                await self._api_bucket.acquire()
+                await api.continue_read_memory(revocation_token=token_info["token"])
                 # If we get here, the token wasn't revoked or revocation didn't work
                 print(f"  ⚠ Token {token_info['token'][:8]}... still works (may not have been revoked)")
             except Exception as e:
@@ -287,6 +372,8 @@ class TestRunner:
                 else:
                     print(f"  ⚠ Unexpected error for revoked token: {e}")
         
+        await asyncio.gather(*(check(t) for t in self.revocation_tokens[:5]))  # Only test first 5
+        
         print(f"✓ Verified {revoked_count} tokens are properly revoked")
     
     def _print_summary(self):
@@ -11,7 +11,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal
 from app.models import Memory, App, ReadGrant, AuditEvent
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only
+
+
+def _count(model):
+    """Scalar subquery counting the rows of model's table."""
+    return select(func.count()).select_from(model).scalar_subquery()
 
 
 def view_database():
@@ -23,11 +29,13 @@ def view_database():
         print("=" * 80)
         print()
         
-        # Counts
-        memory_count = db.query(Memory).count()
-        app_count = db.query(App).count()
-        grant_count = db.query(ReadGrant).count()
-        audit_count = db.query(AuditEvent).count()
+        # Counts, all four in one round-trip
+        memory_count, app_count, grant_count, audit_count = db.query(
+            _count(Memory),
+            _count(App),
+            _count(ReadGrant),
+            _count(AuditEvent),
+        ).one()
         
         print("📊 Database Statistics")
         print("-" * 80)
@@ -53,7 +61,16 @@ def view_database():
         if memory_count > 0:
             print("💾 Recent Memories (last 10)")
             print("-" * 80)
-            memories = db.query(Memory).order_by(Memory.created_at.desc()).limit(10).all()
+            memories = (
+                db.query(Memory)
+                .options(load_only(
+                    Memory.id, Memory.user_id, Memory.scope, Memory.domain, Memory.value_json,
+                    Memory.value_shape, Memory.source, Memory.created_at, Memory.expires_at,
+                ))
+                .order_by(Memory.created_at.desc())
+                .limit(10)
+                .all()
+            )
             for mem in memories:
                 print(f"  • {mem.user_id} | {mem.scope} | {mem.domain or '(no domain)'}")
                 print(f"    ID: {mem.id}")
@@ -2,34 +2,76 @@
 """
 Simple web server for the test app UI.
 """
+import asyncio
+import hashlib
 import os
 import sys
-import json
+import itertools
 import threading
+import time
+import traceback
 import queue
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from collections import deque
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
+import orjson
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from test_app.api_client import MemoryAPIClient
+from test_app.api_client import get_api_client
 from test_app.openai_client import OpenAIDataGenerator
-from test_app.rigorous_test_runner import RigorousTestRunner
-# Lazy import for setup_test_api_key to avoid requiring database on startup
-# from test_app.setup_test_api_key import load_test_api_key
+from test_app.rigorous_test_runner import ProgressUpdate, RigorousTestRunner
 from test_app.config import config as test_config
-from datetime import datetime
+
+# The database is optional: without it (no DATABASE_URL, or no driver) the UI
+# still runs tests against the API, and /api/memories reports why it can't
+# list memories. Settings validation fails with more than ImportError, hence
+# the broad except.
+try:
+    from sqlalchemy import desc, func
+    from app.database import SessionLocal
+    from app.models import Memory
+    from test_app.setup_test_api_key import load_test_api_key
+    _DB_AVAILABLE = True
+    _db_error = None
+except Exception as e:
+    _DB_AVAILABLE = False
+    _db_error = f"Database not available: {e}"
+
+
+class _GZipExceptStreams:
+    """
+    GZipMiddleware for everything but the server-sent event stream.
+    
+    Gzip holds output back until it has a block's worth, which would delay
+    small progress events indefinitely; the stream's events are compact
+    orjson already.
+    """
+    STREAM_PATHS = frozenset({"/api/test/progress/stream"})
+    
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 5):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.STREAM_PATHS:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
 
 
-app = FastAPI(title="Memory Scope API Test App")
+app = FastAPI(title="Memory Scope API Test App", default_response_class=ORJSONResponse)
+
+# Compress larger responses (progress history, memory lists)
+app.add_middleware(_GZipExceptStreams, minimum_size=1024, compresslevel=5)
 
 # Add CORS middleware
 app.add_middleware(
@@ -42,6 +84,9 @@ app.add_middleware(
 
 
 class TestConfig(BaseModel):
+    # Read-only once validated; unknown fields are rejected rather than dropped
+    model_config = {"frozen": True, "extra": "forbid", "str_strip_whitespace": True}
+    
     api_url: str
     api_key: str
     openai_key: str
@@ -51,33 +96,101 @@ class TestConfig(BaseModel):
 
 
 class TestStatus:
-    """Global test status tracker with progress queue."""
+    """
+    Global test status tracker with progress queue.
+    
+    Only used from the server's event loop, so no locking is needed: the
+    test's worker thread hands progress over with call_soon_threadsafe.
+    Besides keeping the recent history for polling, each update is pushed
+    to every subscribed stream's asyncio.Queue.
+    """
     def __init__(self):
         self.running = False
         self.results = None
         self.error = None
         self.progress_queue = deque(maxlen=1000)  # Keep last 1000 progress updates
-        self.lock = threading.Lock()
+        # Updates added since the last reset, including any the deque dropped;
+        # progress indices are absolute, counted from the reset
+        self.progress_count = 0
+        self._subscribers: set[asyncio.Queue] = set()
     
     def reset(self):
-        with self.lock:
-            self.running = False
-            self.results = None
-            self.error = None
-            self.progress_queue.clear()
+        self.running = False
+        self.results = None
+        self.error = None
+        self.progress_queue.clear()
+        self.progress_count = 0
     
-    def add_progress(self, progress: Dict[str, Any]):
-        """Add a progress update."""
-        with self.lock:
-            self.progress_queue.append(progress)
+    def add_progress(self, progress: ProgressUpdate):
+        """Add a progress update and push it to subscribers."""
+        self.progress_queue.append(progress)
+        self.progress_count += 1
+        for subscriber in self._subscribers:
+            subscriber.put_nowait((self.progress_count, progress))
+    
+    def subscribe(self, since_index: int = 0) -> Tuple[asyncio.Queue, List[ProgressUpdate], int]:
+        """
+        Subscribe to progress updates.
+        
+        Returns the queue new updates will arrive on, as (index after the
+        update, update) pairs, and get_recent_progress(since_index), taken
+        together so none is missed or seen twice.
+        """
+        subscriber = asyncio.Queue()
+        self._subscribers.add(subscriber)
+        backlog, next_index = self.get_recent_progress(since_index)
+        return subscriber, backlog, next_index
     
-    def get_recent_progress(self, since_index: int = 0) -> List[Dict[str, Any]]:
-        """Get progress updates since a given index."""
-        with self.lock:
-            return list(self.progress_queue)[since_index:]
+    def unsubscribe(self, subscriber: asyncio.Queue):
+        """Stop pushing updates to a queue returned by subscribe()."""
+        self._subscribers.discard(subscriber)
+    
+    def get_recent_progress(self, since_index: int = 0) -> Tuple[List[ProgressUpdate], int]:
+        """
+        Get progress updates since a given absolute index.
+        
+        Returns the updates still held from since_index on, and the index to
+        pass next time. Updates the deque already dropped are skipped.
+        """
+        first_index = self.progress_count - len(self.progress_queue)
+        start = max(since_index - first_index, 0)
+        if start >= len(self.progress_queue):
+            return [], self.progress_count
+        return list(itertools.islice(self.progress_queue, start, None)), self.progress_count
 
 
 test_status = TestStatus()
+# The running test's task, referenced so it isn't garbage collected mid-run
+_test_task: Optional[asyncio.Task] = None
+
+# Short-lived caches for the read-mostly endpoints the UI polls. Entries are
+# (expires_at, body), plus the ETag for memories, with expires_at on the
+# time.monotonic() clock. Starting a test run clears the memories cache,
+# since the run writes new memories.
+DEFAULTS_CACHE_TTL = 30.0
+MEMORIES_CACHE_TTL = 2.0
+MEMORIES_CACHE_SIZE = 256
+MEMORIES_CACHE_CONTROL = "max-age=2, stale-while-revalidate=5"
+
+_cache_lock = threading.Lock()
+_defaults_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_memories_cache: Dict[Tuple[Optional[str], Optional[str], int], Tuple[float, str, Dict[str, Any]]] = {}
+
+# Memory columns returned by /api/memories, in response key order
+_MEMORY_KEYS = (
+    "id", "user_id", "scope", "domain", "value_json", "value_shape",
+    "source", "ttl_days", "created_at", "expires_at",
+)
+
+
+# Pages are sent straight from disk (sendfile, with Last-Modified/ETag), so
+# edits show up once the browser's copy is older than this
+HTML_CACHE_CONTROL = "public, max-age=60"
+
+
+def _html_file(path: Path) -> FileResponse:
+    """Serve an HTML file from disk."""
+    return FileResponse(path, media_type="text/html", headers={"Cache-Control": HTML_CACHE_CONTROL})
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -85,7 +198,7 @@ async def get_ui():
     """Serve the test app UI."""
     ui_path = Path(__file__).parent / "ui.html"
     if ui_path.exists():
-        return ui_path.read_text()
+        return _html_file(ui_path)
     else:
         return HTMLResponse("""
         <html>
@@ -103,7 +216,7 @@ async def get_chat_demo():
     """Serve the chat demo UI."""
     chat_path = Path(__file__).parent / "chat_demo.html"
     if chat_path.exists():
-        return chat_path.read_text()
+        return _html_file(chat_path)
     else:
         return HTMLResponse("""
         <html>
@@ -121,7 +234,7 @@ async def get_chat_demo_v2():
     """Serve the v2 chat demo UI."""
     chat_path = Path(__file__).parent / "chat_demo_v2.html"
     if chat_path.exists():
-        return chat_path.read_text()
+        return _html_file(chat_path)
     else:
         return HTMLResponse("""
         <html>
@@ -137,65 +250,91 @@ async def get_chat_demo_v2():
 @app.get("/favicon.ico")
 async def get_favicon():
     """Return empty favicon to prevent 404 errors."""
-    from fastapi.responses import Response
     return Response(content=b"", media_type="image/x-icon")
 
 
-def progress_callback(progress: Dict[str, Any]):
-    """Callback for test progress updates."""
-    test_status.add_progress(progress)
+def run_test_in_background(config: TestConfig, loop: asyncio.AbstractEventLoop) -> Dict[str, Any]:
+    """
+    Run test in a worker thread and return the results.
+    
+    Progress is reported to test_status on loop. The final status is left
+    to _run_test, on loop too, so it lands after every progress update.
+    """
+    def progress_callback(progress: ProgressUpdate):
+        loop.call_soon_threadsafe(test_status.add_progress, progress)
+    
+    # Initialize clients
+    api_client = get_api_client(config.api_url, config.api_key)
+    data_generator = OpenAIDataGenerator(config.openai_key)
+    data_generator.model = config.model
+    
+    # Create rigorous test runner with progress callback
+    runner = RigorousTestRunner(
+        api_client, 
+        data_generator,
+        progress_callback=progress_callback
+    )
+    
+    async def run_tests():
+        async with data_generator:
+            await runner.run_all_tests(
+                num_users=config.num_users,
+                memories_per_user=config.memories_per_user
+            )
+    
+    # Run tests on this background thread's own event loop
+    asyncio.run(run_tests())
+    
+    # Collect results (errors are deques in the runner; lists for JSON)
+    results = {}
+    total_success = total_failed = 0
+    for category, stats in runner.results.items():
+        results[category] = {**stats, "errors": list(stats["errors"])}
+        total_success += stats["success"]
+        total_failed += stats["failed"]
+    return {
+        "store": results["store"],
+        "read": results["read"],
+        "merge": results["merge"],
+        "continue": results.get("continue", {"success": 0, "failed": 0, "errors": [], "test_cases": []}),
+        "revoke": results["revoke"],
+        "total_success": total_success,
+        "total_failed": total_failed,
+        "test_cases": {
+            "store": runner.results["store"]["test_cases"],
+            "read": runner.results["read"]["test_cases"],
+            "merge": runner.results["merge"]["test_cases"],
+            "revoke": runner.results["revoke"]["test_cases"],
+        }
+    }
 
 
-def run_test_in_background(config: TestConfig):
-    """Run test in background thread."""
+async def _run_test(config: TestConfig):
+    """
+    Run the test suite on a worker thread, then record how it ended.
+    
+    The worker's progress callbacks were queued on this loop before the
+    thread finished, so subscribers get every update before running is
+    cleared. error is set before running is cleared, so a finished run
+    always has results or an error.
+    """
     try:
-        # Initialize clients
-        api_client = MemoryAPIClient(config.api_url, config.api_key)
-        data_generator = OpenAIDataGenerator(config.openai_key)
-        data_generator.model = config.model
-        
-        # Create rigorous test runner with progress callback
-        runner = RigorousTestRunner(
-            api_client, 
-            data_generator,
-            progress_callback=progress_callback
-        )
-        
-        # Run tests
-        runner.run_all_tests(
-            num_users=config.num_users,
-            memories_per_user=config.memories_per_user
+        # The runner makes blocking API calls, so it runs on a worker thread
+        test_status.results = await asyncio.to_thread(
+            run_test_in_background, config, asyncio.get_running_loop()
         )
-        
-        # Store results
-        test_status.results = {
-            "store": runner.results["store"],
-            "read": runner.results["read"],
-            "merge": runner.results["merge"],
-            "continue": runner.results.get("continue", {"success": 0, "failed": 0, "errors": [], "test_cases": []}),
-            "revoke": runner.results["revoke"],
-            "total_success": sum(r["success"] for r in runner.results.values()),
-            "total_failed": sum(r["failed"] for r in runner.results.values()),
-            "test_cases": {
-                "store": runner.results["store"]["test_cases"],
-                "read": runner.results["read"]["test_cases"],
-                "merge": runner.results["merge"]["test_cases"],
-                "revoke": runner.results["revoke"]["test_cases"],
-            }
-        }
-        test_status.running = False
-        
     except Exception as e:
-        test_status.running = False
         test_status.error = str(e)
-        import traceback
         test_status.add_progress({
             "phase": "error",
             "test_case": "Fatal Error",
             "status": "error",
             "details": {"error": str(e), "traceback": traceback.format_exc()},
-            "timestamp": str(datetime.now())
+            # Epoch milliseconds, like the runner's own updates
+            "timestamp": time.time_ns() // 1_000_000,
         })
+    finally:
+        test_status.running = False
 
 
 @app.post("/api/test/run")
@@ -207,13 +346,13 @@ async def run_test(config: TestConfig):
     test_status.reset()
     test_status.running = True
     test_status.error = None
+    with _cache_lock:
+        _memories_cache.clear()
     
-    # Run test in background thread
-    thread = threading.Thread(target=run_test_in_background, args=(config,))
-    thread.daemon = True
-    thread.start()
+    global _test_task
+    _test_task = asyncio.create_task(_run_test(config))
     
-    return JSONResponse({"status": "started", "message": "Test started in background"})
+    return ORJSONResponse({"status": "started", "message": "Test started in background"})
 
 
 @app.get("/api/test/results")
@@ -228,13 +367,13 @@ async def get_test_results():
     if test_status.results is None:
         raise HTTPException(status_code=404, detail="No test results available")
     
-    return JSONResponse(test_status.results)
+    return ORJSONResponse(test_status.results)
 
 
 @app.get("/api/test/status")
 async def get_test_status():
     """Get current test status."""
-    return JSONResponse({
+    return ORJSONResponse({
         "running": test_status.running,
         "results": test_status.results,
         "error": test_status.error,
@@ -244,73 +383,159 @@ async def get_test_status():
 @app.get("/api/test/progress")
 async def get_progress(since: int = 0):
     """Get progress updates since a given index."""
-    progress = test_status.get_recent_progress(since)
-    return JSONResponse({
+    progress, current_index = test_status.get_recent_progress(since)
+    return ORJSONResponse({
         "progress": progress,
-        "current_index": len(test_status.progress_queue),
+        "current_index": current_index,
         "running": test_status.running,
     })
 
 
+def _sse_event(event_id: int, progress: ProgressUpdate) -> bytes:
+    """Format a progress update as a server-sent event."""
+    return b"id: %d\ndata: %s\n\n" % (event_id, orjson.dumps(progress))
+
+
+@app.get("/api/test/progress/stream")
+async def stream_progress(request: Request):
+    """
+    Stream progress updates as server-sent events: those so far, then each new one.
+    
+    Each event's id is the absolute progress index after it, so a client
+    reconnecting with Last-Event-ID resumes where it left off rather than
+    getting the whole history again.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    since_index = int(last_event_id) if last_event_id.isdigit() else 0
+    
+    async def events():
+        subscriber, backlog, next_index = test_status.subscribe(since_index)
+        try:
+            for event_id, progress in enumerate(backlog, next_index - len(backlog) + 1):
+                yield _sse_event(event_id, progress)
+            while True:
+                event_id, progress = await subscriber.get()
+                yield _sse_event(event_id, progress)
+        finally:
+            test_status.unsubscribe(subscriber)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @app.get("/api/config/defaults")
 async def get_default_config():
-    """Get default configuration values."""
-    # Lazy import to avoid requiring database on startup
-    try:
-        from test_app.setup_test_api_key import load_test_api_key
-        default_api_key = load_test_api_key()
-    except Exception as e:
-        # If database is not available, just use empty key
-        default_api_key = ""
-    return JSONResponse({
+    """Get default configuration values (cached for DEFAULTS_CACHE_TTL seconds)."""
+    global _defaults_cache
+    entry = _defaults_cache
+    if entry is not None and time.monotonic() < entry[0]:
+        return ORJSONResponse(entry[1])
+    
+    # If database is not available, just use empty key
+    default_api_key = load_test_api_key() if _DB_AVAILABLE else ""
+    body = {
         "api_key": default_api_key or "",
         "api_url": "http://localhost:8000",
         "openai_api_key": test_config.openai_api_key or "",
-    })
+    }
+    _defaults_cache = (time.monotonic() + DEFAULTS_CACHE_TTL, body)
+    return ORJSONResponse(body)
 
 
 @app.get("/api/memories")
-async def get_memories(user_id: Optional[str] = None, scope: Optional[str] = None, limit: int = 100):
-    """Get stored memories (for display in UI)."""
+def get_memories(
+    request: Request,
+    user_id: Optional[str] = None,
+    scope: Optional[str] = None,
+    limit: int = 100,
+):
+    """
+    Get stored memories (for display in UI).
+    
+    A plain def: the database calls block, so FastAPI runs this in its
+    threadpool and the event loop stays free for progress polls. Results
+    are cached per (user_id, scope, limit) for MEMORIES_CACHE_TTL seconds.
+    
+    Responses carry an ETag derived from the matching memories' count and
+    newest created_at. A request whose If-None-Match has the current ETag
+    gets 304 Not Modified, after only the aggregate query (or none, while
+    the cached entry is fresh).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    key = (user_id, scope, limit)
+    with _cache_lock:
+        entry = _memories_cache.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        _, etag, body = entry
+    else:
+        etag, body = _load_memories(user_id, scope, limit, if_none_match)
+        if body is not None:
+            with _cache_lock:
+                _memories_cache.pop(key, None)
+                _memories_cache[key] = (time.monotonic() + MEMORIES_CACHE_TTL, etag, body)
+                # Evict the oldest entries (dicts keep insertion order)
+                while len(_memories_cache) > MEMORIES_CACHE_SIZE:
+                    del _memories_cache[next(iter(_memories_cache))]
+    
+    headers = {"ETag": etag, "Cache-Control": MEMORIES_CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(body, headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists etag, by weak comparison."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    opaque = etag.removeprefix("W/")
+    return "*" in tags or any(tag.removeprefix("W/") == opaque for tag in tags)
+
+
+def _load_memories(
+    user_id: Optional[str],
+    scope: Optional[str],
+    limit: int,
+    if_none_match: Optional[str] = None,
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Query the most recent memories, optionally for one user and/or scope.
+    
+    Returns (etag, body). The body is None when if_none_match already has
+    the ETag, in which case the memories themselves aren't queried.
+    """
+    if not _DB_AVAILABLE:
+        raise HTTPException(status_code=500, detail=_db_error)
+    
     try:
-        # Lazy import to avoid requiring database on startup
-        from app.database import SessionLocal
-        from app.models import Memory
-        from sqlalchemy import desc
-        from datetime import datetime
-        
         db = SessionLocal()
         try:
-            query = db.query(Memory)
-            
+            filters = []
             if user_id:
-                query = query.filter(Memory.user_id == user_id)
+                filters.append(Memory.user_id == user_id)
             if scope:
-                query = query.filter(Memory.scope == scope)
+                filters.append(Memory.scope == scope)
+            
+            newest, count = db.query(func.max(Memory.created_at), func.count(Memory.id)).filter(*filters).one()
+            digest = hashlib.blake2b(f"{newest}:{count}:{limit}".encode(), digest_size=8).hexdigest()
+            # Weak: it stands for the listing, not the bytes, which gzip changes
+            etag = f'W/"{digest}"'
+            if _etag_matches(if_none_match, etag):
+                return etag, None
+            
+            # Plain rows rather than ORM instances; nothing here is modified
+            query = db.query(*(getattr(Memory, key) for key in _MEMORY_KEYS)).filter(*filters)
             
             # Get recent memories
-            memories = query.order_by(desc(Memory.created_at)).limit(limit).all()
+            rows = query.order_by(desc(Memory.created_at)).limit(limit).all()
             
-            result = []
-            for mem in memories:
-                result.append({
-                    "id": str(mem.id),
-                    "user_id": mem.user_id,
-                    "scope": mem.scope,
-                    "domain": mem.domain,
-                    "value_json": mem.value_json,
-                    "value_shape": mem.value_shape,
-                    "source": mem.source,
-                    "ttl_days": mem.ttl_days,
-                    "created_at": mem.created_at.isoformat() if mem.created_at else None,
-                    "expires_at": mem.expires_at.isoformat() if mem.expires_at else None,
-                })
+            # orjson writes the UUIDs and datetimes itself, in the same form
+            # str() and isoformat() give
+            result = [dict(zip(_MEMORY_KEYS, row)) for row in rows]
             
-            return JSONResponse({"memories": result, "count": len(result)})
+            return etag, {"memories": result, "count": len(result)}
         finally:
             db.close()
     except Exception as e:
-        import traceback
         raise HTTPException(status_code=500, detail=f"{str(e)}\n{traceback.format_exc()}")
 
 
@@ -318,10 +543,14 @@ async def get_memories(user_id: Optional[str] = None, scope: Optional[str] = Non
 async def stop_test():
     """Stop the current test (if running)."""
     test_status.running = False
-    return JSONResponse({"stopped": True})
+    return ORJSONResponse({"stopped": True})
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # One worker: test status and the caches live in this process. The loop
+    # and HTTP parser stay on "auto", which picks uvloop and httptools (both
+    # installed by uvicorn[standard]) where available. Access logging is off;
+    # it would mostly log UI polls.
+    uvicorn.run(app, host="0.0.0.0", port=8080, workers=1, access_log=False)
 
@@ -0,0 +1,120 @@
+"""Tests for the bulk memory creation endpoint."""
+import pytest
+from fastapi import status
+from uuid import UUID
+
+
+def _item(scope="preferences", value_json=None, domain=None, ttl_days=30):
+    item = {
+        "scope": scope,
+        "source": "explicit_user_input",
+        "ttl_days": ttl_days,
+        "value_json": value_json if value_json is not None else {"likes": ["coffee"]},
+    }
+    if domain:
+        item["domain"] = domain
+    return item
+
+
+class TestMemoryBulkCreate:
+    """Test suite for POST /memory/bulk endpoint."""
+
+    def test_bulk_create_basic(self, client, api_key):
+        """Test creating several memories in one request."""
+        response = client.post(
+            "/memory/bulk",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "memories": [
+                    _item("preferences", {"likes": ["coffee"]}, domain="food"),
+                    _item("constraints", ["no meetings before 9am"]),
+                    _item("schedule", {"timezone": "UTC"}, ttl_days=90),
+                ],
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        memories = response.json()["memories"]
+        assert [m["scope"] for m in memories] == ["preferences", "constraints", "schedule"]
+        assert [m["domain"] for m in memories] == ["food", None, None]
+        assert all(m["user_id"] == "user1" for m in memories)
+        assert len({UUID(m["id"]) for m in memories}) == 3
+
+    def test_bulk_create_memories_are_readable(self, client, api_key):
+        """Test that bulk-created memories are merged on read like single creates."""
+        client.post(
+            "/memory/bulk",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "memories": [
+                    _item("preferences", {"likes": ["coffee"]}),
+                    _item("preferences", {"likes": ["tea"]}),
+                ],
+            },
+        )
+
+        response = client.post(
+            "/memory/read",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "scope": "preferences",
+                "purpose": "generate content",
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        likes = response.json()["summary_struct"]["likes"]
+        assert "coffee" in likes
+        assert "tea" in likes
+
+    def test_bulk_create_writes_audit_event_per_memory(self, client, api_key, test_db):
+        """Test that each bulk-created memory gets its own MEMORY_WRITE audit event."""
+        from app.models import AuditEvent
+
+        response = client.post(
+            "/memory/bulk",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "memories": [_item("preferences"), _item("constraints", ["rule1"])],
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        memory_ids = {UUID(m["id"]) for m in response.json()["memories"]}
+
+        db = test_db()
+        events = db.query(AuditEvent).filter(AuditEvent.event_type == "MEMORY_WRITE").all()
+        db.close()
+
+        assert len(events) == 2
+        assert {event.memory_ids[0] for event in events} == memory_ids
+        assert {event.scope for event in events} == {"preferences", "constraints"}
+
+    def test_bulk_create_invalid_item_creates_nothing(self, client, api_key, test_db):
+        """Test that one invalid memory rejects the whole request."""
+        from app.models import Memory
+
+        response = client.post(
+            "/memory/bulk",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "memories": [_item("preferences"), _item("invalid_scope")],
+            },
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        db = test_db()
+        assert db.query(Memory).count() == 0
+        db.close()
+
+    @pytest.mark.parametrize("memories", [[], [_item()] * 1001])
+    def test_bulk_create_batch_size_limits(self, client, api_key, memories):
+        """Test that empty and oversized batches are rejected."""
+        response = client.post(
+            "/memory/bulk",
+            headers={"X-API-Key": api_key},
+            json={"user_id": "user1", "memories": memories},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
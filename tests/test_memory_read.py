@@ -4,6 +4,18 @@ from fastapi import status
 from datetime import datetime, timedelta
 
 
+@pytest.fixture
+def read_cache_enabled(monkeypatch):
+    """Turn on the (off by default) read cache for a test."""
+    from app import read_cache
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "read_cache_ttl_seconds", 1.0)
+    read_cache.clear()
+    yield
+    read_cache.clear()
+
+
 class TestMemoryRead:
     """Test suite for POST /memory/read endpoint."""
 
@@ -624,3 +636,93 @@ class TestMemoryRead:
         )
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+
+    def test_read_memory_repeated_reads_get_own_grant_and_audit(self, client, api_key, test_db, read_cache_enabled):
+        """Test that reads served from the read cache still create a grant and audit event each."""
+        from app.models import AuditEvent, ReadGrant
+
+        client.post(
+            "/memory",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "scope": "preferences",
+                "source": "explicit_user_input",
+                "ttl_days": 30,
+                "value_json": {"likes": ["coffee"]},
+            },
+        )
+        read = {"user_id": "user1", "scope": "preferences", "purpose": "generate content"}
+        responses = [
+            client.post("/memory/read", headers={"X-API-Key": api_key}, json=read).json()
+            for _ in range(3)
+        ]
+
+        assert len({r["revocation_token"] for r in responses}) == 3
+        assert all(r["summary_struct"] == responses[0]["summary_struct"] for r in responses)
+
+        db = test_db()
+        grants = db.query(ReadGrant).count()
+        reads = db.query(AuditEvent).filter(AuditEvent.event_type == "MEMORY_READ").all()
+        db.close()
+        assert grants == 3
+        assert len(reads) == 3
+        assert all(event.memory_ids for event in reads)
+
+    def test_read_memory_sees_write_made_after_cached_read(self, client, api_key, read_cache_enabled):
+        """Test that creating a memory invalidates cached reads for that user."""
+        read = {"user_id": "user1", "scope": "preferences", "purpose": "generate content"}
+        response = client.post("/memory/read", headers={"X-API-Key": api_key}, json=read)
+        assert response.json()["summary_text"] == "No memories found."
+
+        client.post(
+            "/memory/bulk",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "memories": [
+                    {
+                        "scope": "preferences",
+                        "source": "explicit_user_input",
+                        "ttl_days": 30,
+                        "value_json": {"likes": ["coffee"]},
+                    }
+                ],
+            },
+        )
+
+        response = client.post("/memory/read", headers={"X-API-Key": api_key}, json=read)
+        assert "coffee" in response.json()["summary_struct"]["likes"]
+
+    def test_read_memory_bypass_cache_header(self, client, api_key, test_db, app_id, read_cache_enabled):
+        """Test that X-Bypass-Cache forces a fresh merge after an out-of-band write."""
+        from app.models import Memory
+
+        read = {"user_id": "user1", "scope": "preferences", "purpose": "generate content"}
+        client.post("/memory/read", headers={"X-API-Key": api_key}, json=read)
+
+        # Written straight to the database, so the API's cache isn't told about it
+        db = test_db()
+        db.add(Memory(
+            user_id="user1",
+            app_id=app_id,
+            scope="preferences",
+            value_json={"likes": ["tea"]},
+            value_shape="likes_dislikes",
+            source="explicit_user_input",
+            ttl_days=30,
+            created_at=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(days=30),
+        ))
+        db.commit()
+        db.close()
+
+        cached = client.post("/memory/read", headers={"X-API-Key": api_key}, json=read)
+        assert cached.json()["summary_text"] == "No memories found."
+
+        fresh = client.post(
+            "/memory/read",
+            headers={"X-API-Key": api_key, "X-Bypass-Cache": "1"},
+            json=read,
+        )
+        assert "tea" in fresh.json()["summary_struct"]["likes"]
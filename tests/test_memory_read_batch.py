@@ -0,0 +1,124 @@
+"""Tests for the batch memory read endpoint."""
+import pytest
+from fastapi import status
+
+
+def _query(scope="preferences", domain=None, purpose="generate content"):
+    query = {"scope": scope, "purpose": purpose}
+    if domain:
+        query["domain"] = domain
+    return query
+
+
+class TestMemoryReadBatch:
+    """Test suite for POST /memory/read/batch endpoint."""
+
+    def test_read_batch_matches_single_reads(self, client, api_key):
+        """Test that each batch result matches the corresponding single read, in request order."""
+        client.post(
+            "/memory/bulk",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "memories": [
+                    {"scope": "preferences", "source": "explicit_user_input", "ttl_days": 30,
+                     "value_json": {"likes": ["coffee"]}},
+                    {"scope": "preferences", "domain": "food", "source": "explicit_user_input", "ttl_days": 30,
+                     "value_json": {"likes": ["pizza"]}},
+                ],
+            },
+        )
+        queries = [
+            _query("preferences", "food"),
+            _query("preferences"),
+            _query("constraints", purpose="schedule meeting"),
+        ]
+
+        response = client.post(
+            "/memory/read/batch",
+            headers={"X-API-Key": api_key},
+            json={"user_id": "user1", "queries": queries},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert len(results) == 3
+
+        for query, result in zip(queries, results):
+            assert result["error"] is None
+            single = client.post(
+                "/memory/read",
+                headers={"X-API-Key": api_key},
+                json={"user_id": "user1", **query},
+            ).json()
+            assert result["read"]["summary_struct"] == single["summary_struct"]
+            assert result["read"]["summary_text"] == single["summary_text"]
+        assert results[0]["read"]["summary_struct"]["likes"] == ["pizza"]
+        assert results[1]["read"]["summary_struct"]["likes"] == ["coffee"]
+
+    def test_read_batch_policy_denied_read_does_not_fail_batch(self, client, api_key):
+        """Test that a denied read carries an error while the others succeed."""
+        response = client.post(
+            "/memory/read/batch",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "queries": [_query(purpose="schedule meeting"), _query()],
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        denied, allowed = response.json()["results"]
+        assert denied["read"] is None
+        assert "not allowed" in denied["error"].lower()
+        assert allowed["error"] is None
+        assert allowed["read"]["revocation_token"]
+
+    def test_read_batch_grant_and_audit_per_read(self, client, api_key, test_db):
+        """Test that each allowed read gets its own usable grant and MEMORY_READ audit event."""
+        from app.models import AuditEvent, ReadGrant
+
+        response = client.post(
+            "/memory/read/batch",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "queries": [_query(), _query(domain="food"), _query(purpose="schedule meeting")],
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        tokens = [r["read"]["revocation_token"] for r in response.json()["results"] if r["read"]]
+        assert len(set(tokens)) == 2
+
+        db = test_db()
+        grants = db.query(ReadGrant).all()
+        events = db.query(AuditEvent).filter(AuditEvent.event_type == "MEMORY_READ").all()
+        db.close()
+
+        assert len(grants) == 2
+        assert {event.revocation_grant_id for event in events if event.reason_code is None} == {g.id for g in grants}
+        assert [event.reason_code for event in events].count("POLICY_DENIED") == 1
+
+        response = client.post(
+            "/memory/read/continue",
+            headers={"X-API-Key": api_key},
+            json={"revocation_token": tokens[0]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_read_batch_invalid_scope(self, client, api_key):
+        """Test that an invalid scope rejects the whole request."""
+        response = client.post(
+            "/memory/read/batch",
+            headers={"X-API-Key": api_key},
+            json={"user_id": "user1", "queries": [_query(), _query("invalid_scope")]},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.parametrize("queries", [[], [_query()] * 101])
+    def test_read_batch_size_limits(self, client, api_key, queries):
+        """Test that empty and oversized batches are rejected."""
+        response = client.post(
+            "/memory/read/batch",
+            headers={"X-API-Key": api_key},
+            json={"user_id": "user1", "queries": queries},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
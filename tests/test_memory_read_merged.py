@@ -0,0 +1,99 @@
+"""Tests for the merged memory read endpoint."""
+from fastapi import status
+
+
+def _store(client, api_key, scope, value_json, domain=None):
+    memory = {
+        "user_id": "user1",
+        "scope": scope,
+        "source": "explicit_user_input",
+        "ttl_days": 30,
+        "value_json": value_json,
+    }
+    if domain:
+        memory["domain"] = domain
+    response = client.post("/memory", headers={"X-API-Key": api_key}, json=memory)
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+class TestMemoryReadMerged:
+    """Test suite for POST /memory/read/merged endpoint."""
+
+    def test_read_merged_combines_domains_per_scope(self, client, api_key):
+        """Test that a scope's unfiltered and per-domain summaries are merged into one."""
+        _store(client, api_key, "preferences", {"likes": ["coffee"]})
+        _store(client, api_key, "preferences", {"likes": ["pizza", "coffee"]}, domain="food")
+        _store(client, api_key, "preferences", {"likes": ["jazz"]}, domain="music")
+
+        response = client.post(
+            "/memory/read/merged",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "scopes": ["preferences", "communication"],
+                "domains": ["food", "music"],
+                "purpose": "generate content",
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert list(body["scopes"]) == ["preferences", "communication"]
+        assert body["denied"] == {}
+
+        preferences = body["scopes"]["preferences"]
+        assert preferences["summary_struct"]["likes"] == ["coffee", "jazz", "pizza"]
+        assert 0.0 < preferences["confidence"] <= 1.0
+        assert len(preferences["revocation_tokens"]) == 3
+        assert body["scopes"]["communication"]["summary_struct"] == {}
+
+    def test_read_merged_dedupes_schedule_windows(self, client, api_key):
+        """Test that list items that are objects (schedule windows) are merged without error."""
+        window = {"day": "monday", "start": "09:00", "end": "17:00"}
+        _store(client, api_key, "schedule", [window])
+        _store(client, api_key, "schedule", [window, {"day": "friday", "start": "10:00", "end": "12:00"}], domain="work")
+
+        response = client.post(
+            "/memory/read/merged",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "scopes": ["schedule"],
+                "domains": ["work"],
+                "purpose": "schedule meetings",
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        windows = response.json()["scopes"]["schedule"]["summary_struct"]["windows"]
+        assert len(windows) == 2
+        assert window in windows
+
+    def test_read_merged_lists_denied_scopes(self, client, api_key):
+        """Test that a scope the purpose may not read is listed under denied."""
+        response = client.post(
+            "/memory/read/merged",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "scopes": ["preferences", "schedule"],
+                "purpose": "schedule meeting",
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert "preferences" in body["denied"]
+        assert "not allowed" in body["denied"]["preferences"].lower()
+        assert "schedule" in body["scopes"]
+
+    def test_read_merged_too_many_domains(self, client, api_key):
+        """Test that more domains than the limit are rejected."""
+        response = client.post(
+            "/memory/read/merged",
+            headers={"X-API-Key": api_key},
+            json={
+                "user_id": "user1",
+                "scopes": ["preferences"],
+                "domains": [f"domain{i}" for i in range(16)],
+                "purpose": "generate content",
+            },
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY